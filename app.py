@@ -12,7 +12,8 @@ sys.path.insert(0, str(src_dir))
 
 try:
     from algorithms import PathAlgorithms
-    from graph_creator import crear_grafo, validar_grafo
+    from graph_creator import crear_grafo, validar_grafo, grafo_desde_dataframe
+    from spatial_index import obtener_indice_espacial
     from visualization import visualizar_grafo_interactivo
 except ImportError as e:
     st.error(f"Error importando módulos: {e}")
@@ -61,6 +62,10 @@ if modo == "📁 Cargar CSV Existente":
         type=['csv'],
         help="El CSV debe tener columnas: nodo_origen, nodo_destino, weight"
     )
+    dirigido = st.checkbox(
+        "Aristas dirigidas (un solo sentido: nodo_origen → nodo_destino)",
+        key="dirigido_checkbox"
+    )
     
     if archivo_csv is not None:
         try:
@@ -70,7 +75,7 @@ if modo == "📁 Cargar CSV Existente":
             if not all(col in df.columns for col in ['nodo_origen', 'nodo_destino', 'weight']):
                 st.error("El CSV debe contener las columnas: nodo_origen, nodo_destino, weight")
             else:
-                grafo = nx.from_pandas_edgelist(df, 'nodo_origen', 'nodo_destino', ['weight'])
+                grafo = grafo_desde_dataframe(df, dirigido)
                 st.session_state.grafo = grafo
                 st.session_state.nodos_disponibles = list(grafo.nodes())
                 st.success(f"✅ Grafo cargado: {len(st.session_state.nodos_disponibles)} nodos, {grafo.number_of_edges()} aristas")
@@ -138,23 +143,46 @@ if st.session_state.grafo is not None and len(st.session_state.nodos_disponibles
     st.markdown("---")
     st.header("🎯 Configurar y Ejecutar Algoritmo")
     
+    # Con coordenadas en los nodos se puede elegir por punto (x, y) en vez de por id
+    try:
+        indice_espacial = obtener_indice_espacial(st.session_state.grafo)
+    except ValueError:
+        indice_espacial = None
+    modo_seleccion = "Nodo"
+    if indice_espacial is not None:
+        modo_seleccion = st.radio("Elegir origen y destino por", ["Nodo", "Coordenadas"],
+                                  horizontal=True, key="modo_seleccion")
+
     col1, col2, col3 = st.columns(3)
     
-    with col1:
-        origen = st.selectbox(
-            "Nodo Origen",
-            options=st.session_state.nodos_disponibles,
-            index=0,
-            key="origen_select"
-        )
-    
-    with col2:
-        destino = st.selectbox(
-            "Nodo Destino", 
-            options=st.session_state.nodos_disponibles,
-            index=min(1, len(st.session_state.nodos_disponibles)-1),
-            key="destino_select"
-        )
+    if modo_seleccion == "Coordenadas":
+        with col1:
+            x_origen = st.number_input("Origen X", value=float(indice_espacial.minimo[0]), key="x_origen")
+            y_origen = st.number_input("Origen Y", value=float(indice_espacial.minimo[1]), key="y_origen")
+            origen, ajuste = indice_espacial.mas_cercano(x_origen, y_origen)
+            st.caption(f"Nodo más cercano: {origen} (a {ajuste:.2f})")
+
+        with col2:
+            x_destino = st.number_input("Destino X", value=float(indice_espacial.pos[:, 0].max()), key="x_destino")
+            y_destino = st.number_input("Destino Y", value=float(indice_espacial.pos[:, 1].max()), key="y_destino")
+            destino, ajuste = indice_espacial.mas_cercano(x_destino, y_destino)
+            st.caption(f"Nodo más cercano: {destino} (a {ajuste:.2f})")
+    else:
+        with col1:
+            origen = st.selectbox(
+                "Nodo Origen",
+                options=st.session_state.nodos_disponibles,
+                index=0,
+                key="origen_select"
+            )
+
+        with col2:
+            destino = st.selectbox(
+                "Nodo Destino", 
+                options=st.session_state.nodos_disponibles,
+                index=min(1, len(st.session_state.nodos_disponibles)-1),
+                key="destino_select"
+            )
     
     with col3:
         algoritmo_seleccionado = st.selectbox(
@@ -0,0 +1,64 @@
+"""
+Benchmark: Dijkstra bidireccional serial vs paralelo (hilos / procesos)
+
+La aceleración se calcula contra 'serial_alternado': las mismas dos
+mitades y la misma regla de parada en un solo hilo, de modo que mide sólo
+el paralelismo. 'dijkstra_bidireccional' (PathAlgorithms) se muestra como
+referencia; su diferencia incluye también la regla de parada y las listas
+CSR.
+
+Uso: python benchmarks/bench_bidireccional_paralelo.py [num_nodos ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from algorithms import PathAlgorithms
+from graph_creator import crear_grafo
+from parallel_search import BusquedaBidireccionalParalela, gil_habilitado
+from query_sampler import MuestreadorConsultas
+
+
+def medir(func, consultas):
+    """Tiempo total y distancias de una serie de consultas"""
+    t0 = time.perf_counter()
+    distancias = [func(o, d)['distancia'] for o, d, _ in consultas]
+    return time.perf_counter() - t0, np.array(distancias)
+
+
+def main(tamanos, num_consultas=20):
+    print(f"GIL habilitado: {gil_habilitado()}")
+    print(f"{'nodos':>8} {'modo':>16} {'tiempo_total_s':>15} {'aceleracion':>12}")
+    algoritmos = PathAlgorithms()
+
+    for num_nodos in tamanos:
+        np.random.seed(42)
+        # Radio elegido para mantener el grado medio aproximadamente constante
+        grafo = crear_grafo(num_nodos, 1000, 1000 * (12 / (np.pi * num_nodos)) ** 0.5)
+        consultas = MuestreadorConsultas(grafo).muestrear(num_consultas)
+
+        with BusquedaBidireccionalParalela(grafo, 'serial') as busqueda:
+            t_serial, d_serial = medir(busqueda.buscar, consultas)
+
+        t_base, d_base = medir(
+            lambda o, d: algoritmos.dijkstra_bidireccional(grafo, o, d), consultas)
+        assert np.allclose(d_serial, d_base), "Distancias distintas en serial_alternado"
+        print(f"{num_nodos:>8} {'bidireccional':>16} {t_base:>15.4f} {t_serial / t_base:>12.2f}")
+        print(f"{num_nodos:>8} {'serial_alternado':>16} {t_serial:>15.4f} {1.0:>12.2f}")
+
+        for modo in ('hilos', 'procesos'):
+            with BusquedaBidireccionalParalela(grafo, modo) as busqueda:
+                t_modo, d_modo = medir(busqueda.buscar, consultas)
+            assert np.allclose(d_serial, d_modo), f"Distancias distintas en modo {modo}"
+            print(f"{num_nodos:>8} {modo:>16} {t_modo:>15.4f} {t_serial / t_modo:>12.2f}")
+
+
+if __name__ == "__main__":
+    tamanos = [int(x) for x in sys.argv[1:]] or [1000, 2000, 5000]
+    main(tamanos)
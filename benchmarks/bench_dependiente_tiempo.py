@@ -0,0 +1,70 @@
+"""
+Benchmark: perfiles dependientes del tiempo frente al modo estático.
+
+Para cada tamaño reporta la memoria por arco (pesos estáticos vs.
+arreglos de perfiles) y el tiempo por consulta de Dijkstra/A* estáticos
+(dijkstra_con_contador / astar_con_heuristica), y de sus variantes
+dependientes del tiempo con perfiles constantes y con horas punta.
+
+Uso: python benchmarks/bench_dependiente_tiempo.py [num_nodos ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from algorithms import PathAlgorithms
+from graph_arrays import GrafoCSR
+from graph_creator import crear_grafo
+from time_dependent import (astar_dependiente_tiempo, dijkstra_dependiente_tiempo,
+                            perfiles_constantes, perfiles_hora_punta)
+
+
+def tiempo_promedio(func, consultas):
+    t0 = time.perf_counter()
+    for consulta in consultas:
+        func(*consulta)
+    return (time.perf_counter() - t0) / len(consultas) * 1000.0
+
+
+def main(tamanos, num_consultas=30):
+    algoritmos = PathAlgorithms()
+    print(f"{'nodos':>7} {'B/arco est':>11} {'B/arco perfil':>14} {'modo':>12} "
+          f"{'dijkstra_ms':>12} {'astar_ms':>9}")
+
+    for num_nodos in tamanos:
+        np.random.seed(42)
+        grafo = crear_grafo(num_nodos, 1000, 1000 * (12 / (np.pi * num_nodos)) ** 0.5)
+        csr = GrafoCSR.desde_networkx(grafo)
+        constantes = perfiles_constantes(csr)
+        punta = perfiles_hora_punta(csr)
+
+        rng = np.random.default_rng(0)
+        pares = [tuple(p) for p in rng.choice(num_nodos, size=(num_consultas, 2)).tolist()]
+        bytes_estatico = csr.pesos.nbytes / csr.num_arcos
+        bytes_perfil = punta.memoria_perfiles_bytes() / punta.num_arcos
+
+        filas = [
+            ('estatico',
+             tiempo_promedio(lambda o, d: algoritmos.dijkstra_con_contador(grafo, o, d), pares),
+             tiempo_promedio(lambda o, d: algoritmos.astar_con_heuristica(grafo, o, d), pares)),
+            ('td_constante',
+             tiempo_promedio(lambda o, d: dijkstra_dependiente_tiempo(constantes, o, d, 480.0), pares),
+             tiempo_promedio(lambda o, d: astar_dependiente_tiempo(constantes, o, d, 480.0), pares)),
+            ('td_punta',
+             tiempo_promedio(lambda o, d: dijkstra_dependiente_tiempo(punta, o, d, 480.0), pares),
+             tiempo_promedio(lambda o, d: astar_dependiente_tiempo(punta, o, d, 480.0), pares)),
+        ]
+        for modo, t_dijkstra, t_astar in filas:
+            print(f"{num_nodos:>7} {bytes_estatico:>11.1f} {bytes_perfil:>14.1f} {modo:>12} "
+                  f"{t_dijkstra:>12.3f} {t_astar:>9.3f}")
+
+
+if __name__ == "__main__":
+    tamanos = [int(x) for x in sys.argv[1:]] or [1000, 5000]
+    main(tamanos)
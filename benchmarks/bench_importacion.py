@@ -0,0 +1,73 @@
+"""
+Benchmark: tiempo de importación (python -X importtime) de los puntos de
+entrada. Falla (código de salida 1) si la ruta ligera de consultas carga
+algún módulo pesado o supera el límite de tiempo.
+
+Uso: python benchmarks/bench_importacion.py [limite_ms]
+"""
+
+import os
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+raiz = os.path.join(current_dir, '..')
+
+MODULOS_PESADOS = ('pandas', 'matplotlib', 'pyvis', 'networkx')
+
+# nombre -> (código a importar, ¿debe evitar los módulos pesados?)
+ENTRADAS = {
+    'cli_ruta': ("import ruta, parallel_search", True),
+    'paquete_src': ("import src", True),
+    'graph_creator': ("import graph_creator", False),
+    'experiment_runner': ("import experiment_runner", False),
+}
+
+
+def medir_importacion(codigo):
+    """
+    Ejecuta 'codigo' en un intérprete nuevo con -X importtime.
+
+    Returns:
+        (tiempo total en ms, conjunto de módulos de primer nivel importados)
+    """
+    entorno = dict(os.environ, PYTHONPATH=os.pathsep.join([raiz, os.path.join(raiz, 'src')]))
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo],
+                             capture_output=True, text=True, env=entorno, cwd=raiz, check=True)
+
+    total_us = 0
+    modulos = set()
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        modulos.add(nombre.strip().split('.')[0])
+        # Los hijos llevan sangría extra; el acumulado de un módulo de primer
+        # nivel ya incluye a sus hijos, así que sólo se suman esos
+        if not nombre.startswith('  '):
+            total_us += int(acumulado)
+    return total_us / 1000.0, modulos
+
+
+def main():
+    limite_ms = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    regresiones = []
+
+    print(f"{'entrada':<20}{'tiempo (ms)':>12}  módulos pesados")
+    for nombre, (codigo, debe_ser_ligera) in ENTRADAS.items():
+        tiempo_ms, modulos = medir_importacion(codigo)
+        pesados = sorted(m for m in MODULOS_PESADOS if m in modulos)
+        print(f"{nombre:<20}{tiempo_ms:>12.1f}  {', '.join(pesados) or '-'}")
+
+        if debe_ser_ligera and pesados:
+            regresiones.append(f"{nombre} importa {', '.join(pesados)}")
+        if debe_ser_ligera and limite_ms is not None and tiempo_ms > limite_ms:
+            regresiones.append(f"{nombre} tarda {tiempo_ms:.1f} ms (límite {limite_ms:.1f} ms)")
+
+    for mensaje in regresiones:
+        print(f"❌ {mensaje}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
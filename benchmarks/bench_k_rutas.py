@@ -0,0 +1,61 @@
+"""
+Benchmark: k rutas más cortas (Yen con árbol inverso) vs Yen ingenuo
+(Dijkstra completo por desvío) vs networkx.shortest_simple_paths
+
+Uso: python benchmarks/bench_k_rutas.py [num_nodos]
+"""
+
+import itertools
+import os
+import sys
+import time
+
+import networkx as nx
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from algorithms import PathAlgorithms
+from graph_creator import crear_grafo
+from query_sampler import MuestreadorConsultas
+
+
+def main(num_nodos=300, valores_k=(1, 5, 10, 25, 50), num_consultas=5):
+    np.random.seed(42)
+    grafo = crear_grafo(num_nodos, 1000, 1000 * (12 / (np.pi * num_nodos)) ** 0.5)
+    consultas = MuestreadorConsultas(grafo).muestrear(num_consultas)
+    algoritmos = PathAlgorithms()
+
+    print(f"Grafo: {grafo.number_of_nodes()} nodos, {grafo.number_of_edges()} aristas")
+    print(f"{'k':>4} {'yen_arbol_s':>12} {'yen_ingenuo_s':>14} {'networkx_s':>11} {'coinciden':>10}")
+
+    for k in valores_k:
+        tiempos = {'arbol': 0.0, 'ingenuo': 0.0, 'networkx': 0.0}
+        coinciden = True
+
+        for origen, destino, _ in consultas:
+            t0 = time.perf_counter()
+            rutas = algoritmos.k_rutas_mas_cortas(grafo, origen, destino, k)
+            tiempos['arbol'] += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            rutas_ingenuas = algoritmos.k_rutas_mas_cortas(
+                grafo, origen, destino, k, reutilizar_arbol=False)
+            tiempos['ingenuo'] += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            referencia = [nx.path_weight(grafo, ruta, 'weight') for ruta in itertools.islice(
+                nx.shortest_simple_paths(grafo, origen, destino, 'weight'), k)]
+            tiempos['networkx'] += time.perf_counter() - t0
+
+            distancias = [r['distancia'] for r in rutas]
+            coinciden &= np.allclose(distancias, referencia)
+            coinciden &= np.allclose([r['distancia'] for r in rutas_ingenuas], referencia)
+
+        print(f"{k:>4} {tiempos['arbol']:>12.4f} {tiempos['ingenuo']:>14.4f} "
+              f"{tiempos['networkx']:>11.4f} {str(coinciden):>10}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,161 @@
+"""
+Benchmark: PathAlgorithms frente a motores de referencia (NetworkX y, si
+está instalado, scipy.sparse.csgraph) sobre las mismas consultas que
+ejecutar_todos_los_casos: generar_consultas con la misma semilla y, por
+defecto, la misma estrategia de muestreo que el runner ("uniforme", que
+puede incluir pares sin ruta; todos los motores devuelven inf).
+
+Para cada tamaño y motor reporta el tiempo medio por consulta, la
+velocidad relativa a dijkstra_con_contador, el pico de memoria
+(tracemalloc) y si las distancias coinciden. Las filas se agregan a un
+CSV con fecha y commit para seguir la evolución en el tiempo.
+
+Uso: python benchmarks/bench_referencias.py [--estrategia NOMBRE] [num_nodos ...]
+"""
+
+import inspect
+import math
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from algorithms import PathAlgorithms
+from experiment_runner import ejecutar_todos_los_casos, generar_consultas
+from graph_arrays import GrafoCSR
+from graph_creator import crear_grafo
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+    HAY_SCIPY = True
+except ImportError:
+    HAY_SCIPY = False
+
+# Misma estrategia por defecto que ejecutar_todos_los_casos
+ESTRATEGIA_RUNNER = inspect.signature(ejecutar_todos_los_casos).parameters['estrategia'].default
+
+ARCHIVO_SALIDA = os.path.normpath(os.path.join(current_dir, '..', 'results', 'bench_referencias.csv'))
+
+
+def commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=current_dir,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def motores(grafo):
+    """nombre -> función (origen, destino) que devuelve la distancia"""
+    algoritmos = PathAlgorithms()
+
+    def heuristica(u, v):
+        (x1, y1), (x2, y2) = grafo.nodes[u]['pos'], grafo.nodes[v]['pos']
+        return math.hypot(x1 - x2, y1 - y2)
+
+    def sin_ruta(func):
+        def envuelta(o, d):
+            try:
+                return func(o, d)
+            except nx.NetworkXNoPath:
+                return float('inf')
+        return envuelta
+
+    resultado = {
+        'dijkstra_con_contador': lambda o, d: algoritmos.dijkstra_con_contador(grafo, o, d)['distancia'],
+        'astar_con_heuristica': lambda o, d: algoritmos.astar_con_heuristica(grafo, o, d)['distancia'],
+        'dijkstra_bidireccional': lambda o, d: algoritmos.dijkstra_bidireccional(grafo, o, d)['distancia'],
+        'nx.dijkstra_path': sin_ruta(
+            lambda o, d: nx.path_weight(grafo, nx.dijkstra_path(grafo, o, d), 'weight')),
+        'nx.astar_path': sin_ruta(
+            lambda o, d: nx.path_weight(grafo, nx.astar_path(grafo, o, d, heuristica), 'weight')),
+        'nx.bidirectional_dijkstra': sin_ruta(lambda o, d: nx.bidirectional_dijkstra(grafo, o, d)[0]),
+    }
+
+    if HAY_SCIPY:
+        # La matriz se arma una vez por grafo, fuera de la medición
+        csr = GrafoCSR.desde_networkx(grafo)
+        matriz = csr_matrix((csr.pesos, csr.indices, csr.indptr), shape=(csr.num_nodos, csr.num_nodos))
+
+        def scipy_dijkstra(o, d):
+            distancias = csgraph_dijkstra(matriz, directed=True, indices=csr.indice[o])
+            return float(distancias[csr.indice[d]])
+        resultado['scipy.csgraph.dijkstra'] = scipy_dijkstra
+
+    return resultado
+
+
+def medir(func, consultas):
+    """Tiempo medio (sin tracemalloc) y pico de memoria medio (con tracemalloc)"""
+    t0 = time.perf_counter()
+    distancias = [func(o, d) for o, d, _ in consultas]
+    tiempo = (time.perf_counter() - t0) / len(consultas)
+
+    picos = []
+    for o, d, _ in consultas:
+        tracemalloc.start()
+        func(o, d)
+        picos.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return distancias, tiempo, sum(picos) / len(picos) / 1024.0
+
+
+def main(tamanos, num_casos=30, semilla=42, estrategia=ESTRATEGIA_RUNNER, archivo_salida=ARCHIVO_SALIDA):
+    fecha = datetime.now().isoformat(timespec='seconds')
+    commit = commit_actual()
+    filas = []
+
+    for num_nodos in tamanos:
+        np.random.seed(semilla)
+        grafo = crear_grafo(num_nodos, 1000, 1000 * (12 / (np.pi * num_nodos)) ** 0.5)
+        consultas = generar_consultas(grafo, num_casos, semilla, estrategia)
+
+        referencia = None
+        for nombre, func in motores(grafo).items():
+            distancias, tiempo, memoria_kb = medir(func, consultas)
+            if referencia is None:
+                referencia = (distancias, tiempo)
+            coinciden = sum(d == r or abs(d - r) <= 1e-6 * max(1.0, abs(r))
+                            for d, r in zip(distancias, referencia[0]))
+            filas.append({
+                'fecha': fecha,
+                'commit': commit,
+                'num_nodos': num_nodos,
+                'num_aristas': grafo.number_of_edges(),
+                'estrategia': estrategia,
+                'motor': nombre,
+                'tiempo_ms': tiempo * 1000.0,
+                'aceleracion_vs_dijkstra': referencia[1] / tiempo if tiempo > 0 else float('inf'),
+                'memoria_peak_KB': memoria_kb,
+                'distancias_coinciden': f"{coinciden}/{len(consultas)}",
+            })
+
+    tabla = pd.DataFrame(filas)
+    print(tabla.drop(columns=['fecha', 'commit']).to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    if not HAY_SCIPY:
+        print("scipy no está instalado: se omite scipy.csgraph.dijkstra")
+
+    os.makedirs(os.path.dirname(archivo_salida), exist_ok=True)
+    tabla.to_csv(archivo_salida, mode='a', index=False, header=not os.path.exists(archivo_salida))
+    print(f"Resultados agregados a: {archivo_salida}")
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    estrategia = ESTRATEGIA_RUNNER
+    if '--estrategia' in argumentos:
+        i = argumentos.index('--estrategia')
+        estrategia = argumentos[i + 1]
+        del argumentos[i:i + 2]
+    tamanos = [int(x) for x in argumentos] or [500, 2000, 5000]
+    main(tamanos, estrategia=estrategia)
@@ -0,0 +1,70 @@
+"""
+Benchmark: efecto del reordenamiento de nodos (Hilbert / RCM) en el tiempo
+de las búsquedas sobre arreglos (delta-stepping uno-a-todos y Dijkstra
+bidireccional con hilos)
+
+Uso: python benchmarks/bench_reordenamiento.py [num_nodos ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from delta_stepping import delta_stepping
+from graph_arrays import GrafoCSR
+from graph_creator import crear_grafo
+from parallel_search import BusquedaBidireccionalParalela
+from reordering import reordenar_grafo
+
+
+def brecha_media(csr):
+    """Distancia media en memoria entre los extremos de cada arco"""
+    origenes = np.repeat(np.arange(csr.num_nodos), np.diff(csr.indptr))
+    return float(np.abs(origenes - csr.indices).mean())
+
+
+def mejor_de(repeticiones, func):
+    """Menor tiempo de varias repeticiones, para reducir el ruido"""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        func()
+        tiempos.append(time.perf_counter() - t0)
+    return min(tiempos)
+
+
+def main(tamanos, num_consultas=30, repeticiones=3):
+    print(f"{'nodos':>7} {'orden':>9} {'brecha_media':>13} {'delta_stepping_s':>17} {'bidireccional_s':>16}")
+
+    for num_nodos in tamanos:
+        np.random.seed(42)
+        grafo = crear_grafo(num_nodos, 1000, 1000 * (12 / (np.pi * num_nodos)) ** 0.5)
+        original = GrafoCSR.desde_networkx(grafo)
+        rng = np.random.default_rng(0)
+        pares = rng.choice(num_nodos, size=(num_consultas, 2)).tolist()
+
+        variantes = {'original': original}
+        for metodo in ('hilbert', 'rcm'):
+            variantes[metodo] = reordenar_grafo(original, metodo)
+
+        for nombre, csr in variantes.items():
+            # Las consultas se expresan siempre en ids originales
+            fuentes = [csr.indice[original.nodos[o]] for o, _ in pares]
+            t_delta = mejor_de(repeticiones, lambda: [delta_stepping(csr, f) for f in fuentes])
+
+            with BusquedaBidireccionalParalela(csr, 'hilos') as busqueda:
+                t_bidir = mejor_de(repeticiones, lambda: [
+                    busqueda.buscar(original.nodos[o], original.nodos[d]) for o, d in pares])
+
+            print(f"{num_nodos:>7} {nombre:>9} {brecha_media(csr):>13.1f} "
+                  f"{t_delta:>17.4f} {t_bidir:>16.4f}")
+
+
+if __name__ == "__main__":
+    tamanos = [int(x) for x in sys.argv[1:]] or [2000, 5000]
+    main(tamanos)
@@ -0,0 +1,68 @@
+"""
+Benchmark: búsquedas sobre el almacenamiento por teselas (GrafoTeselado)
+con distintos presupuestos de memoria, con y sin precarga.
+
+Reporta por consulta la tasa de aciertos de teselas, los bytes leídos de
+disco y el tiempo, y verifica que las distancias coincidan con las del
+grafo en memoria.
+
+Uso: python benchmarks/bench_teselas.py [num_nodos ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'src'))
+
+from algorithms import PathAlgorithms
+from graph_arrays import GrafoCSR
+from graph_creator import crear_grafo
+from tiled_storage import GrafoTeselado, escribir_teselas
+
+
+def main(tamanos, num_teselas=64, num_consultas=10, fracciones=(0.25, 0.5, 2.0)):
+    algoritmos = PathAlgorithms()
+    funciones = {
+        'dijkstra': algoritmos.dijkstra_con_contador,
+        'astar': algoritmos.astar_con_heuristica,
+        'bidireccional': algoritmos.dijkstra_bidireccional,
+    }
+    print(f"{'nodos':>7} {'presupuesto':>11} {'precarga':>8} {'algoritmo':>13} "
+          f"{'aciertos':>9} {'KB_leidos':>10} {'ms':>8} {'iguales':>8}")
+
+    for num_nodos in tamanos:
+        np.random.seed(42)
+        grafo = crear_grafo(num_nodos, 1000, 1000 * (12 / (np.pi * num_nodos)) ** 0.5)
+        rng = np.random.default_rng(0)
+        pares = rng.choice(num_nodos, size=(num_consultas, 2)).tolist()
+        referencias = {nombre: [f(grafo, o, d)['distancia'] for o, d in pares]
+                       for nombre, f in funciones.items()}
+
+        with tempfile.TemporaryDirectory() as directorio:
+            info = escribir_teselas(GrafoCSR.desde_networkx(grafo), directorio, num_teselas)
+
+            for fraccion in fracciones:
+                for precargar in (False, True):
+                    with GrafoTeselado(directorio, int(info['bytes_totales'] * fraccion), precargar) as teselado:
+                        for nombre, f in funciones.items():
+                            aciertos, bytes_leidos, iguales = [], [], True
+                            t0 = time.perf_counter()
+                            for (o, d), ref in zip(pares, referencias[nombre]):
+                                res = teselado.consultar(f, o, d)
+                                aciertos.append(res['tasa_aciertos'])
+                                bytes_leidos.append(res['bytes_leidos'])
+                                iguales &= res['distancia'] == ref or abs(res['distancia'] - ref) < 1e-6
+                            ms = (time.perf_counter() - t0) / len(pares) * 1000.0
+                            print(f"{num_nodos:>7} {fraccion:>10.0%} {str(precargar):>8} {nombre:>13} "
+                                  f"{np.mean(aciertos):>9.3f} {np.mean(bytes_leidos) / 1024:>10.1f} "
+                                  f"{ms:>8.2f} {str(iguales):>8}")
+
+
+if __name__ == "__main__":
+    tamanos = [int(x) for x in sys.argv[1:]] or [2000]
+    main(tamanos)
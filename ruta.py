@@ -0,0 +1,84 @@
+"""
+Consulta de rutas desde la línea de comandos sobre un grafo binario (.npz)
+
+Sólo carga NumPy y los módulos de búsqueda sobre arreglos: no importa
+pandas, NetworkX, matplotlib ni pyvis, así que el arranque es rápido.
+
+Uso:
+    python ruta.py convertir grafo.csv grafo.npz [--dirigido]
+    python ruta.py buscar grafo.npz ORIGEN DESTINO
+"""
+
+import argparse
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from graph_arrays import GrafoCSR
+
+
+def convertir(archivo_csv, archivo_npz, dirigido=False):
+    """CSV de guardar_grafo_csv → .npz de GrafoCSR (este paso sí usa pandas)"""
+    from graph_creator import cargar_grafo_csv
+
+    csr = GrafoCSR.desde_networkx(cargar_grafo_csv(archivo_csv, dirigido))
+    csr.guardar(archivo_npz)
+    print(f"Grafo guardado en '{archivo_npz}': {csr.num_nodos} nodos, {csr.num_arcos} arcos")
+
+
+def leer_id(csr, texto):
+    """Interpreta el id de nodo con el tipo de los ids guardados"""
+    for nodo in csr.nodos[:1]:
+        if isinstance(nodo, int):
+            return int(texto)
+        if isinstance(nodo, float):
+            return float(texto)
+    return texto
+
+
+def buscar(archivo_npz, origen, destino):
+    from parallel_search import BusquedaBidireccionalParalela
+
+    csr = GrafoCSR.cargar(archivo_npz)
+    origen, destino = leer_id(csr, origen), leer_id(csr, destino)
+    for nodo in (origen, destino):
+        if nodo not in csr.indice:
+            raise SystemExit(f"El nodo {nodo} no existe en el grafo")
+
+    with BusquedaBidireccionalParalela(csr, modo='hilos') as busqueda:
+        resultado = busqueda.buscar(origen, destino)
+
+    if not resultado['ruta']:
+        print(f"No hay ruta entre {origen} y {destino}")
+        return 1
+    print(f"Distancia: {resultado['distancia']:.4f}")
+    print(f"Ruta: {' -> '.join(str(n) for n in resultado['ruta'])}")
+    print(f"Nodos expandidos: {resultado['nodos_expandidos']}  Tiempo: {resultado['tiempo']:.6f} s")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rutas más cortas sobre un grafo binario (.npz)")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_convertir = sub.add_parser('convertir', help="convierte un CSV de aristas a .npz")
+    p_convertir.add_argument('csv')
+    p_convertir.add_argument('npz')
+    p_convertir.add_argument('--dirigido', action='store_true')
+
+    p_buscar = sub.add_parser('buscar', help="ruta más corta entre dos nodos")
+    p_buscar.add_argument('npz')
+    p_buscar.add_argument('origen')
+    p_buscar.add_argument('destino')
+
+    args = parser.parse_args(argv)
+    if args.comando == 'convertir':
+        convertir(args.csv, args.npz, args.dirigido)
+        return 0
+    return buscar(args.npz, args.origen, args.destino)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
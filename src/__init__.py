@@ -1,8 +1,32 @@
 # src/__init__.py
-from .algorithms import PathAlgorithms
-from .experiment_runner import (
-    ejecutar_todos_los_casos,
-    generar_csv_resultados,
-    calcular_estadisticas
-)
-from .graph_creator import crear_grafo, validar_grafo
+# Los módulos se importan al usar el nombre por primera vez: importar el
+# paquete no carga pandas ni NetworkX hasta que hacen falta.
+import importlib
+
+_EXPORTADOS = {
+    'PathAlgorithms': 'algorithms',
+    'ejecutar_todos_los_casos': 'experiment_runner',
+    'generar_csv_resultados': 'experiment_runner',
+    'calcular_estadisticas': 'experiment_runner',
+    'crear_grafo': 'graph_creator',
+    'validar_grafo': 'graph_creator',
+    'validar_grafo_vectorizado': 'graph_creator',
+    'calcular_componentes': 'graph_creator',
+    'mismo_componente': 'graph_creator',
+    'GrafoCSR': 'graph_arrays',
+    'invalidar_caches': 'graph_arrays',
+}
+
+__all__ = list(_EXPORTADOS)
+
+
+def __getattr__(nombre):
+    if nombre not in _EXPORTADOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(f".{_EXPORTADOS[nombre]}", __name__), nombre)
+    globals()[nombre] = valor  # Las siguientes consultas ya no pasan por aquí
+    return valor
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
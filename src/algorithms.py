@@ -3,18 +3,29 @@ import heapq
 import time
 from collections import defaultdict
 
+import numpy as np
+
+from spatial_index import obtener_indice_espacial
+
 
 class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
 
     # en este bloque se pretende encontrar la ruta más corta expandiendo nodos por orden de distancia
-    def dijkstra_con_contador(self, grafo, origen, destino):
+    def dijkstra_con_contador(self, grafo, origen, destino, componentes=None):
         """
         Configura Dijkstra con contador de nodos expandidos
 
+        Args:
+            componentes: reporte["componentes"] de validar_grafo_vectorizado; si
+                origen y destino están en componentes distintas se responde
+                sin buscar
+
         Returns:
             dict con ruta, distancia, nodos_expandidos, tiempo
         """
         start_time = time.time()  # Inicia desde el nodo origen con distancia 0
+        if self._es_inalcanzable(componentes, origen, destino):
+            return self._resultado_inalcanzable(start_time)
         nodos_expandidos = 0  # Expande siempre el nodo más cercano no visitado
         # Actualiza distancias de vecinos si encuentra un camino mejor
         # Inicialización                                                                              #Cuenta cada nodo que expande
@@ -72,7 +83,7 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
             # Fallback para grafos sin posiciones
             return 0
 
-    def astar_con_heuristica(self, grafo, origen, destino):
+    def astar_con_heuristica(self, grafo, origen, destino, componentes=None):
         """
         Configura A* con la heurística euclidiana implementada
 
@@ -80,6 +91,8 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
             dict con ruta, distancia, nodos_expandidos, tiempo
         """
         start_time = time.time()
+        if self._es_inalcanzable(componentes, origen, destino):
+            return self._resultado_inalcanzable(start_time)
         nodos_expandidos = 0
 
         # Inicialización A*
@@ -121,7 +134,7 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
         }
 
     # Buscar desde ambos extremos simultáneamente para mayor eficiencia.
-    def dijkstra_bidireccional(self, grafo, origen, destino):
+    def dijkstra_bidireccional(self, grafo, origen, destino, componentes=None):
         """
         Configura Dijkstra Bidireccional para búsqueda optimizada
 
@@ -129,6 +142,8 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
             dict con ruta, distancia, nodos_expandidos, tiempo
         """
         start_time = time.time()  # Dos búsquedas simultáneas: origen→destino y destino→origen
+        if self._es_inalcanzable(componentes, origen, destino):
+            return self._resultado_inalcanzable(start_time)
         nodos_expandidos_total = 0  # Expande alternadamente de ambas colas
         # Encuentra punto medio donde se juntan las búsquedas
         # Búsqueda forward (origen → destino)                                             #Combina ambas mitades de la ruta
@@ -144,6 +159,10 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
         pred_backward = {}
         cola_backward = [(0, destino)]
 
+        # En un DiGraph la búsqueda backward recorre los arcos entrantes;
+        # NetworkX ya mantiene ese índice inverso (grafo.predecessors)
+        vecinos_backward = grafo.predecessors if grafo.is_directed() else grafo.neighbors
+
         # Variables para el encuentro
         mejor_distancia = float('inf')
         nodo_encuentro = None
@@ -180,9 +199,9 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
                         dist_forward.get(nodo_b, float('inf'))
                     nodo_encuentro = nodo_b
 
-                # Expandir vecinos en dirección backward
-                for vecino in grafo.neighbors(nodo_b):
-                    peso = grafo[nodo_b][vecino].get('weight', 1)
+                # Expandir vecinos en dirección backward (arcos entrantes si es dirigido)
+                for vecino in vecinos_backward(nodo_b):
+                    peso = grafo[vecino][nodo_b].get('weight', 1)
                     nueva_dist = dist_b + peso
                     if nueva_dist < dist_backward[vecino]:
                         dist_backward[vecino] = nueva_dist
@@ -201,6 +220,405 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
             'tiempo': time.time() - start_time
         }
 
+    # Variantes con presupuesto: descartan cualquier etiqueta que lo supere
+    def dijkstra_acotado(self, grafo, origen, destino, presupuesto):
+        """
+        Dijkstra que poda toda etiqueta con distancia > presupuesto.
+
+        Responde "¿hay ruta de costo <= presupuesto?": si no la hay, la
+        búsqueda se agota dentro de la bola de radio presupuesto.
+
+        Returns:
+            dict con ruta, distancia, nodos_expandidos, tiempo
+            (ruta vacía y distancia inf si se excede el presupuesto)
+        """
+        start_time = time.time()
+        nodos_expandidos = 0
+
+        distancias = {origen: 0}
+        predecesores = {}
+        cola_prioridad = [(0, origen)]
+
+        while cola_prioridad:
+            distancia_actual, nodo_actual = heapq.heappop(cola_prioridad)
+            if distancia_actual > distancias[nodo_actual]:
+                continue  # Entrada obsoleta
+            nodos_expandidos += 1
+
+            if nodo_actual == destino:
+                break
+
+            for vecino in grafo.neighbors(nodo_actual):
+                peso = grafo[nodo_actual][vecino].get('weight', 1)
+                nueva_distancia = distancia_actual + peso
+
+                # Poda por presupuesto
+                if nueva_distancia > presupuesto:
+                    continue
+                if nueva_distancia < distancias.get(vecino, float('inf')):
+                    distancias[vecino] = nueva_distancia
+                    predecesores[vecino] = nodo_actual
+                    heapq.heappush(cola_prioridad, (nueva_distancia, vecino))
+
+        return {
+            'ruta': self._reconstruir_ruta(predecesores, origen, destino),
+            'distancia': distancias.get(destino, float('inf')),
+            'nodos_expandidos': nodos_expandidos,
+            'tiempo': time.time() - start_time
+        }
+
+    def astar_acotado(self, grafo, origen, destino, presupuesto):
+        """
+        A* que poda todo nodo con f = g + h > presupuesto.
+
+        Como la heurística euclidiana es admisible, ningún nodo podado
+        puede estar en una ruta de costo <= presupuesto.
+
+        Returns:
+            dict con ruta, distancia, nodos_expandidos, tiempo
+        """
+        start_time = time.time()
+        nodos_expandidos = 0
+
+        g_score = {origen: 0}
+        predecesores = {}
+        h_origen = self._heuristica_euclidiana(grafo, origen, destino)
+        cola_prioridad = [(h_origen, 0, origen)] if h_origen <= presupuesto else []
+
+        while cola_prioridad:
+            _, g_actual, nodo_actual = heapq.heappop(cola_prioridad)
+            if g_actual > g_score[nodo_actual]:
+                continue  # Entrada obsoleta
+            nodos_expandidos += 1
+
+            if nodo_actual == destino:
+                break
+
+            for vecino in grafo.neighbors(nodo_actual):
+                peso = grafo[nodo_actual][vecino].get('weight', 1)
+                tentative_g_score = g_actual + peso
+
+                if tentative_g_score < g_score.get(vecino, float('inf')):
+                    f = tentative_g_score + \
+                        self._heuristica_euclidiana(grafo, vecino, destino)
+                    # Poda por presupuesto
+                    if f > presupuesto:
+                        continue
+                    g_score[vecino] = tentative_g_score
+                    predecesores[vecino] = nodo_actual
+                    heapq.heappush(cola_prioridad, (f, tentative_g_score, vecino))
+
+        return {
+            'ruta': self._reconstruir_ruta(predecesores, origen, destino),
+            'distancia': g_score.get(destino, float('inf')),
+            'nodos_expandidos': nodos_expandidos,
+            'tiempo': time.time() - start_time
+        }
+
+    def isocrona(self, grafo, origen, radio):
+        """
+        Todos los nodos alcanzables desde origen con distancia <= radio.
+
+        Returns:
+            dict con nodos y distancias (arreglos NumPy en orden de
+            asentamiento), nodos_expandidos, tiempo
+        """
+        start_time = time.time()
+
+        distancias = {origen: 0}
+        asentados = []
+        distancias_asentadas = []
+        cola_prioridad = [(0, origen)]
+
+        while cola_prioridad:
+            distancia_actual, nodo_actual = heapq.heappop(cola_prioridad)
+            if distancia_actual > distancias[nodo_actual]:
+                continue
+            asentados.append(nodo_actual)
+            distancias_asentadas.append(distancia_actual)
+
+            for vecino in grafo.neighbors(nodo_actual):
+                peso = grafo[nodo_actual][vecino].get('weight', 1)
+                nueva_distancia = distancia_actual + peso
+                if nueva_distancia <= radio and nueva_distancia < distancias.get(vecino, float('inf')):
+                    distancias[vecino] = nueva_distancia
+                    heapq.heappush(cola_prioridad, (nueva_distancia, vecino))
+
+        return {
+            'nodos': np.array(asentados),
+            'distancias': np.array(distancias_asentadas, dtype=np.float64),
+            'nodos_expandidos': len(asentados),
+            'tiempo': time.time() - start_time
+        }
+
+    def k_objetivos_mas_cercanos(self, grafo, origen, objetivos, k, radio=float('inf')):
+        """
+        Los k nodos de 'objetivos' más cercanos a origen.
+
+        La búsqueda se detiene en cuanto asienta el k-ésimo objetivo (o al
+        agotar la bola de radio 'radio').
+
+        Returns:
+            dict con objetivos y distancias (arreglos NumPy ordenados por
+            distancia), rutas, nodos_expandidos, tiempo
+        """
+        start_time = time.time()
+        nodos_expandidos = 0
+        objetivos = set(objetivos)
+
+        distancias = {origen: 0}
+        predecesores = {}
+        encontrados = []
+        cola_prioridad = [(0, origen)]
+
+        while cola_prioridad and len(encontrados) < k:
+            distancia_actual, nodo_actual = heapq.heappop(cola_prioridad)
+            if distancia_actual > distancias[nodo_actual]:
+                continue
+            nodos_expandidos += 1
+
+            if nodo_actual in objetivos:
+                encontrados.append(nodo_actual)
+                if len(encontrados) == k:
+                    break
+
+            for vecino in grafo.neighbors(nodo_actual):
+                peso = grafo[nodo_actual][vecino].get('weight', 1)
+                nueva_distancia = distancia_actual + peso
+                if nueva_distancia <= radio and nueva_distancia < distancias.get(vecino, float('inf')):
+                    distancias[vecino] = nueva_distancia
+                    predecesores[vecino] = nodo_actual
+                    heapq.heappush(cola_prioridad, (nueva_distancia, vecino))
+
+        return {
+            'objetivos': np.array(encontrados),
+            'distancias': np.array([distancias[n] for n in encontrados], dtype=np.float64),
+            'rutas': [self._reconstruir_ruta(predecesores, origen, n) if n != origen else [origen]
+                      for n in encontrados],
+            'nodos_expandidos': nodos_expandidos,
+            'tiempo': time.time() - start_time
+        }
+
+    # k rutas más cortas sin ciclos (Yen) reutilizando el árbol inverso hacia el destino
+    def _arbol_inverso(self, grafo, destino):
+        """
+        Dijkstra desde el destino sobre los arcos entrantes.
+
+        Returns:
+            (dist_destino, siguiente): distancia de cada nodo al destino y
+            el siguiente salto de su ruta más corta hacia él
+        """
+        vecinos_entrantes = grafo.predecessors if grafo.is_directed() else grafo.neighbors
+        dist_destino = {destino: 0}
+        siguiente = {}
+        cola_prioridad = [(0, destino)]
+
+        while cola_prioridad:
+            distancia_actual, nodo_actual = heapq.heappop(cola_prioridad)
+            if distancia_actual > dist_destino[nodo_actual]:
+                continue
+            for vecino in vecinos_entrantes(nodo_actual):
+                nueva_distancia = distancia_actual + grafo[vecino][nodo_actual].get('weight', 1)
+                if nueva_distancia < dist_destino.get(vecino, float('inf')):
+                    dist_destino[vecino] = nueva_distancia
+                    siguiente[vecino] = nodo_actual
+                    heapq.heappush(cola_prioridad, (nueva_distancia, vecino))
+
+        return dist_destino, siguiente
+
+    def _ruta_desvio(self, grafo, desvio, destino, nodos_bloqueados, aristas_bloqueadas,
+                     dist_destino, siguiente):
+        """
+        Ruta más corta desvio → destino evitando nodos y aristas bloqueados.
+
+        Si la rama del árbol inverso no toca nada bloqueado es la respuesta
+        directa. Si no, se corre A* con h = distancia en el árbol, que es
+        exacta en el grafo completo y por eso consistente al bloquear cosas.
+
+        Returns:
+            (ruta, distancia, nodos_expandidos); ruta vacía si no existe
+        """
+        no_dirigido = not grafo.is_directed()
+
+        def bloqueada(u, v):
+            return (u, v) in aristas_bloqueadas or (no_dirigido and (v, u) in aristas_bloqueadas)
+
+        if desvio not in dist_destino:
+            return [], float('inf'), 0
+
+        # Atajo: reutilizar la rama del árbol inverso
+        ruta = [desvio]
+        while ruta[-1] != destino:
+            proximo = siguiente[ruta[-1]]
+            if proximo in nodos_bloqueados or bloqueada(ruta[-1], proximo):
+                break
+            ruta.append(proximo)
+        else:
+            return ruta, dist_destino[desvio], 0
+
+        # A* guiado por el árbol inverso
+        nodos_expandidos = 0
+        g_score = {desvio: 0}
+        predecesores = {}
+        cola_prioridad = [(dist_destino[desvio], 0, desvio)]
+
+        while cola_prioridad:
+            _, g_actual, nodo_actual = heapq.heappop(cola_prioridad)
+            if g_actual > g_score[nodo_actual]:
+                continue
+            nodos_expandidos += 1
+            if nodo_actual == destino:
+                return (self._reconstruir_ruta(predecesores, desvio, destino),
+                        g_actual, nodos_expandidos)
+
+            for vecino in grafo.neighbors(nodo_actual):
+                if vecino in nodos_bloqueados or vecino not in dist_destino or \
+                        bloqueada(nodo_actual, vecino):
+                    continue
+                tentative_g_score = g_actual + grafo[nodo_actual][vecino].get('weight', 1)
+                if tentative_g_score < g_score.get(vecino, float('inf')):
+                    g_score[vecino] = tentative_g_score
+                    predecesores[vecino] = nodo_actual
+                    heapq.heappush(cola_prioridad, (tentative_g_score + dist_destino[vecino],
+                                                    tentative_g_score, vecino))
+
+        return [], float('inf'), nodos_expandidos
+
+    def _ruta_desvio_ingenua(self, grafo, desvio, destino, nodos_bloqueados, aristas_bloqueadas):
+        """Desvío con Dijkstra completo sobre una copia sin lo bloqueado (línea base)"""
+        restringido = grafo.copy()
+        restringido.remove_nodes_from(nodos_bloqueados)
+        restringido.remove_edges_from(
+            (u, v) for u, v in aristas_bloqueadas if restringido.has_edge(u, v))
+        if desvio not in restringido or destino not in restringido:
+            return [], float('inf'), 0
+        resultado = self.dijkstra_con_contador(restringido, desvio, destino)
+        if desvio == destino:
+            resultado['ruta'] = [desvio]
+        return resultado['ruta'], resultado['distancia'], resultado['nodos_expandidos']
+
+    def k_rutas_mas_cortas(self, grafo, origen, destino, k, reutilizar_arbol=True):
+        """
+        Las k rutas sin ciclos más cortas (algoritmo de Yen).
+
+        Con reutilizar_arbol=True las búsquedas de desvío usan el árbol de
+        rutas más cortas hacia el destino (calculado una vez); con False
+        cada desvío es un Dijkstra completo, como línea base.
+        Los candidatos se guardan en un heap y se deduplican por ruta.
+
+        Returns:
+            lista de hasta k dicts con ruta, distancia, nodos_expandidos,
+            tiempo (acumulado hasta encontrar esa ruta), en orden de distancia
+        """
+        start_time = time.time()
+        dist_destino, siguiente = self._arbol_inverso(grafo, destino)
+        if origen not in dist_destino or k <= 0:
+            return []
+
+        def peso(u, v):
+            return grafo[u][v].get('weight', 1)
+
+        def desvio_desde(nodo, nodos_bloqueados, aristas_bloqueadas):
+            if reutilizar_arbol:
+                return self._ruta_desvio(grafo, nodo, destino, nodos_bloqueados,
+                                         aristas_bloqueadas, dist_destino, siguiente)
+            return self._ruta_desvio_ingenua(grafo, nodo, destino, nodos_bloqueados,
+                                             aristas_bloqueadas)
+
+        ruta, distancia, nodos_expandidos = desvio_desde(origen, set(), set())
+        encontradas = [{'ruta': ruta, 'distancia': distancia,
+                        'nodos_expandidos': nodos_expandidos, 'tiempo': time.time() - start_time}]
+        candidatos = []
+        vistas = {tuple(ruta)}
+
+        while len(encontradas) < k:
+            anterior = encontradas[-1]['ruta']
+            nodos_expandidos = 0
+            costo_raiz = 0
+
+            for i in range(len(anterior) - 1):
+                nodo_desvio = anterior[i]
+                raiz = anterior[:i + 1]
+
+                # Bloquear las aristas ya usadas desde esta raíz y los nodos de la raíz
+                aristas_bloqueadas = {(r['ruta'][i], r['ruta'][i + 1]) for r in encontradas
+                                      if len(r['ruta']) > i + 1 and r['ruta'][:i + 1] == raiz}
+                nodos_bloqueados = set(raiz[:-1])
+
+                ruta_desvio, costo_desvio, expandidos = desvio_desde(
+                    nodo_desvio, nodos_bloqueados, aristas_bloqueadas)
+                nodos_expandidos += expandidos
+
+                if ruta_desvio:
+                    ruta_total = raiz[:-1] + ruta_desvio
+                    if tuple(ruta_total) not in vistas:
+                        vistas.add(tuple(ruta_total))
+                        heapq.heappush(candidatos, (costo_raiz + costo_desvio, len(ruta_total), ruta_total))
+
+                costo_raiz += peso(anterior[i], anterior[i + 1])
+
+            if not candidatos:
+                break
+            distancia, _, ruta = heapq.heappop(candidatos)
+            encontradas.append({'ruta': ruta, 'distancia': distancia,
+                                'nodos_expandidos': nodos_expandidos,
+                                'tiempo': time.time() - start_time})
+
+        return encontradas
+
+    # Consultas por coordenadas: se ajusta cada punto a su nodo más cercano
+    def ruta_por_coordenadas(self, grafo, coord_origen, coord_destino, algoritmo='astar', componentes=None):
+        """
+        Ruta entre dos puntos (x, y) cualesquiera. Cada punto se ajusta al
+        nodo más cercano con el índice espacial del grafo (construido una
+        vez y cacheado en grafo.graph['indice_espacial']).
+
+        Args:
+            algoritmo: 'dijkstra', 'astar' o 'bidireccional'
+
+        Returns:
+            dict del algoritmo más origen, destino (nodos elegidos) y
+            ajuste_origen, ajuste_destino (distancia de cada punto a su nodo)
+        """
+        funciones = {
+            'dijkstra': self.dijkstra_con_contador,
+            'astar': self.astar_con_heuristica,
+            'bidireccional': self.dijkstra_bidireccional,
+        }
+        if algoritmo not in funciones:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+
+        indice = obtener_indice_espacial(grafo)
+        origen, ajuste_origen = indice.mas_cercano(*coord_origen)
+        destino, ajuste_destino = indice.mas_cercano(*coord_destino)
+
+        resultado = funciones[algoritmo](grafo, origen, destino, componentes)
+        resultado.update({
+            'origen': origen,
+            'destino': destino,
+            'ajuste_origen': ajuste_origen,
+            'ajuste_destino': ajuste_destino
+        })
+        return resultado
+
+    # Descarte en O(1) de pares en componentes distintas
+    def _es_inalcanzable(self, componentes, origen, destino):
+        """Usa el índice nodo→componente de validar_grafo_vectorizado"""
+        if componentes is None:
+            return False
+        indice = componentes['indice_nodo']
+        componente_de = componentes['componente_de']
+        return componente_de[indice[origen]] != componente_de[indice[destino]]
+
+    def _resultado_inalcanzable(self, start_time):
+        """Resultado vacío para un destino inalcanzable"""
+        return {
+            'ruta': [],
+            'distancia': float('inf'),
+            'nodos_expandidos': 0,
+            'tiempo': time.time() - start_time
+        }
+
     # Funciones helper para construir la ruta final a partir de los predecesores
     def _reconstruir_ruta(self, predecesores, origen, destino):
         """Reconstruye la ruta desde el destino hasta el origen"""
@@ -292,7 +710,7 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
         }
 
     # Orquestar la ejecución completa de los 3 algoritmos + validación.
-    def ejecutar_todos_algoritmos(self, grafo, origen, destino):
+    def ejecutar_todos_algoritmos(self, grafo, origen, destino, componentes=None):
         """
         Ejecuta los 3 algoritmos y valida que den la misma ruta óptima
 
@@ -304,11 +722,12 @@ class PathAlgorithms:  # Implementa los 3 algoritmos de búsqueda de rutas
         # Recolecta resultados de cada uno
         # Configurar y ejecutar los 3 algoritmos                                             #Valida consistencia entre ellos
         resultado_dijkstra = self.dijkstra_con_contador(
-            grafo, origen, destino)  # Retorna todos los resultados organizados
+            grafo, origen, destino, componentes)  # Retorna todos los resultados organizados
         # Punto de entrada principal para usar los algoritmos
-        resultado_astar = self.astar_con_heuristica(grafo, origen, destino)
+        resultado_astar = self.astar_con_heuristica(
+            grafo, origen, destino, componentes)
         resultado_bidireccional = self.dijkstra_bidireccional(
-            grafo, origen, destino)
+            grafo, origen, destino, componentes)
 
         # Validar que todos dan la misma ruta óptima
         validacion = self.verificar_rutas_iguales(
@@ -0,0 +1,146 @@
+# -----------------------------------Dijkstra / A* con cola de cubetas (Dial)-----------------------
+import math
+import time
+
+
+class ColaDial:  # Cola de prioridad monótona de cubetas circulares para claves enteras
+
+    def __init__(self, rango):
+        """
+        Args:
+            rango: diferencia máxima entre la clave mínima actual y cualquier
+                clave insertada (el peso entero máximo C para Dijkstra)
+        """
+        self.num_cubetas = rango + 1
+        self.cubetas = [[] for _ in range(self.num_cubetas)]
+        self.actual = 0
+        self.tamano = 0
+
+    def insertar(self, clave, elemento):
+        """Inserta con clave en [actual, actual + rango]; O(1)"""
+        self.cubetas[clave % self.num_cubetas].append((clave, elemento))
+        self.tamano += 1
+
+    def extraer_min(self):
+        """Devuelve (clave, elemento) con la menor clave; O(1) amortizado"""
+        cubeta = self.cubetas[self.actual % self.num_cubetas]
+        while not cubeta:
+            self.actual += 1
+            cubeta = self.cubetas[self.actual % self.num_cubetas]
+        self.tamano -= 1
+        return cubeta.pop()
+
+    def __len__(self):
+        return self.tamano
+
+
+def _peso_maximo(grafo, atributo):
+    """Peso entero máximo del grafo (define el número de cubetas)"""
+    return max((data[atributo] for _, _, data in grafo.edges(data=True)), default=0)
+
+
+def _ruta(predecesores, origen, destino):
+    if destino != origen and destino not in predecesores:
+        return []
+    ruta = [destino]
+    while ruta[-1] != origen:
+        ruta.append(predecesores[ruta[-1]])
+    return ruta[::-1]
+
+
+def dijkstra_cubetas(grafo, origen, destino, atributo='peso_entero'):
+    """
+    Dijkstra con la cola de Dial sobre pesos enteros (ver cuantizar_pesos).
+
+    Returns:
+        dict con ruta, distancia (en unidades originales: entera * resolución),
+        distancia_entera, nodos_expandidos, tiempo
+    """
+    start_time = time.time()
+    nodos_expandidos = 0
+    resolucion = grafo.graph.get('resolucion', 1)
+
+    distancias = {origen: 0}
+    predecesores = {}
+    cola = ColaDial(_peso_maximo(grafo, atributo))
+    cola.insertar(0, origen)
+
+    while cola:
+        distancia_actual, nodo_actual = cola.extraer_min()
+        if distancia_actual > distancias[nodo_actual]:
+            continue  # Entrada obsoleta
+        nodos_expandidos += 1
+
+        if nodo_actual == destino:
+            break
+
+        for vecino, data in grafo[nodo_actual].items():
+            nueva_distancia = distancia_actual + data[atributo]
+            if nueva_distancia < distancias.get(vecino, math.inf):
+                distancias[vecino] = nueva_distancia
+                predecesores[vecino] = nodo_actual
+                cola.insertar(nueva_distancia, vecino)
+
+    distancia_entera = distancias.get(destino, math.inf)
+    return {
+        'ruta': _ruta(predecesores, origen, destino),
+        'distancia': distancia_entera * resolucion,
+        'distancia_entera': distancia_entera,
+        'nodos_expandidos': nodos_expandidos,
+        'tiempo': time.time() - start_time
+    }
+
+
+def astar_cubetas(grafo, origen, destino, atributo='peso_entero'):
+    """
+    A* con la cola de Dial. La heurística es floor(euclidiana / resolución),
+    que es consistente con los pesos cuantizados hacia arriba, así que las
+    claves f nunca bajan del cubo actual.
+
+    Returns:
+        dict con ruta, distancia, distancia_entera, nodos_expandidos, tiempo
+    """
+    start_time = time.time()
+    nodos_expandidos = 0
+    resolucion = grafo.graph.get('resolucion', 1)
+
+    pos_destino = grafo.nodes[destino].get('pos')
+
+    def heuristica(nodo):
+        pos = grafo.nodes[nodo].get('pos')
+        if pos is None or pos_destino is None:
+            return 0
+        return int(math.hypot(pos[0] - pos_destino[0], pos[1] - pos_destino[1]) // resolucion)
+
+    g_score = {origen: 0}
+    predecesores = {}
+    # f puede crecer hasta 2C por arista: C del peso y C de la heurística
+    cola = ColaDial(2 * _peso_maximo(grafo, atributo))
+    cola.actual = heuristica(origen)
+    cola.insertar(cola.actual, (0, origen))
+
+    while cola:
+        _, (g_actual, nodo_actual) = cola.extraer_min()
+        if g_actual > g_score[nodo_actual]:
+            continue
+        nodos_expandidos += 1
+
+        if nodo_actual == destino:
+            break
+
+        for vecino, data in grafo[nodo_actual].items():
+            tentative_g_score = g_actual + data[atributo]
+            if tentative_g_score < g_score.get(vecino, math.inf):
+                g_score[vecino] = tentative_g_score
+                predecesores[vecino] = nodo_actual
+                cola.insertar(tentative_g_score + heuristica(vecino),
+                              (tentative_g_score, vecino))
+
+    distancia_entera = g_score.get(destino, math.inf)
+    return {
+        'ruta': _ruta(predecesores, origen, destino),
+        'distancia': distancia_entera * resolucion,
+        'distancia_entera': distancia_entera,
+        'nodos_expandidos': nodos_expandidos,
+        'tiempo': time.time() - start_time
+    }
@@ -0,0 +1,184 @@
+# -----------------------------------Delta-stepping vectorizado-----------------------
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from algorithms import PathAlgorithms
+from graph_arrays import obtener_csr
+
+
+def delta_por_defecto(csr):
+    """Delta = peso máximo / grado medio, la elección habitual de Meyer y Sanders"""
+    if csr.num_arcos == 0:
+        return 1.0
+    grado_medio = csr.num_arcos / max(csr.num_nodos, 1)
+    return max(float(csr.pesos.max()) / grado_medio, 1e-12)
+
+
+def _reunir_arcos(csr, frontera, mascara):
+    """
+    Arcos (origen, destino, peso) que salen de los nodos de 'frontera',
+    filtrados por 'mascara' (ligeros o pesados), sin bucles en Python.
+    """
+    inicios = csr.indptr[frontera]
+    conteos = csr.indptr[frontera + 1] - inicios
+    total = int(conteos.sum())
+    if total == 0:
+        vacio = np.empty(0, dtype=np.int64)
+        return vacio, vacio, np.empty(0)
+
+    arcos = np.repeat(inicios - (np.cumsum(conteos) - conteos), conteos) + np.arange(total)
+    seleccion = mascara[arcos]
+    arcos = arcos[seleccion]
+    origenes = np.repeat(frontera, conteos)[seleccion]
+    return origenes, csr.indices[arcos], csr.pesos[arcos]
+
+
+def _relajar(csr, dist, pred, frontera, mascara, executor, num_hilos):
+    """
+    Relaja todos los arcos de la frontera a la vez con np.minimum.at.
+    Con varios hilos, cada uno reúne los arcos de un trozo de la frontera.
+
+    Returns:
+        arreglo con los nodos cuya distancia mejoró
+    """
+    if executor is not None and len(frontera) >= 2 * num_hilos:
+        trozos = np.array_split(frontera, num_hilos)
+        partes = list(executor.map(lambda f: _reunir_arcos(csr, f, mascara), trozos))
+        origenes = np.concatenate([p[0] for p in partes])
+        destinos = np.concatenate([p[1] for p in partes])
+        pesos = np.concatenate([p[2] for p in partes])
+    else:
+        origenes, destinos, pesos = _reunir_arcos(csr, frontera, mascara)
+
+    candidatos = dist[origenes] + pesos
+    mejoran = candidatos < dist[destinos]
+    if not mejoran.any():
+        return np.empty(0, dtype=np.int64)
+    origenes, destinos, candidatos = origenes[mejoran], destinos[mejoran], candidatos[mejoran]
+
+    np.minimum.at(dist, destinos, candidatos)
+    ganadores = candidatos == dist[destinos]
+    pred[destinos[ganadores]] = origenes[ganadores]
+    return np.unique(destinos)
+
+
+def delta_stepping(csr, origen, delta=None, num_hilos=1, destino=None):
+    """
+    SSSP delta-stepping sobre un GrafoCSR (índices 0..n-1).
+
+    Los nodos se agrupan en cubetas de ancho delta; cada cubeta se vacía
+    relajando en bloque sus arcos ligeros (peso <= delta) hasta que no
+    cambia, y después sus arcos pesados una sola vez. Si se da 'destino'
+    (índice) se termina en cuanto su cubeta queda cerrada.
+
+    Returns:
+        dict con distancias y predecesores (arreglos por índice),
+        nodos_expandidos, fases, tiempo
+    """
+    start_time = time.time()
+    n = csr.num_nodos
+    delta = delta or delta_por_defecto(csr)
+    ligeros = csr.pesos <= delta
+    pesados = ~ligeros
+
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    cerrado = np.zeros(n, dtype=bool)
+    dist[origen] = 0.0
+    nodos_expandidos = 0
+    fases = 0
+
+    executor = ThreadPoolExecutor(max_workers=num_hilos) if num_hilos > 1 else None
+    try:
+        while destino is None or not cerrado[destino]:
+            pendientes = np.flatnonzero(~cerrado & np.isfinite(dist))
+            if len(pendientes) == 0:
+                break
+            cubeta = math.floor(dist[pendientes].min() / delta)
+
+            limite = (cubeta + 1) * delta
+            frontera = pendientes[dist[pendientes] < limite]
+            vaciados = [frontera]
+
+            # Fase ligera: repetir mientras se reinserten nodos en la cubeta
+            while len(frontera):
+                fases += 1
+                nodos_expandidos += len(frontera)
+                mejorados = _relajar(csr, dist, pred, frontera, ligeros, executor, num_hilos)
+                frontera = mejorados[dist[mejorados] < limite]
+                vaciados.append(frontera)
+
+            # Fase pesada: una sola vez con todos los nodos de la cubeta
+            asentados = np.unique(np.concatenate(vaciados))
+            _relajar(csr, dist, pred, asentados, pesados, executor, num_hilos)
+            cerrado[asentados] = True
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        'distancias': dist,
+        'predecesores': pred,
+        'nodos_expandidos': nodos_expandidos,
+        'fases': fases,
+        'tiempo': time.time() - start_time
+    }
+
+
+def delta_stepping_ruta(grafo, origen, destino, delta=None, num_hilos=1):
+    """
+    Consulta punto a punto con delta-stepping sobre un grafo de NetworkX.
+    El CSR se construye una vez por grafo (obtener_csr); si cambian los
+    pesos hay que llamar antes a invalidar_caches(grafo).
+
+    Returns:
+        dict con ruta, distancia, nodos_expandidos, tiempo
+    """
+    start_time = time.time()
+    csr = obtener_csr(grafo)
+    s, t = csr.indice[origen], csr.indice[destino]
+    resultado = delta_stepping(csr, s, delta, num_hilos, destino=t)
+
+    ruta = []
+    if np.isfinite(resultado['distancias'][t]):
+        ruta = [t]
+        while ruta[-1] != s:
+            ruta.append(int(resultado['predecesores'][ruta[-1]]))
+        ruta = csr.ruta_a_ids(ruta[::-1])
+
+    return {
+        'ruta': ruta,
+        'distancia': float(resultado['distancias'][t]),
+        'nodos_expandidos': resultado['nodos_expandidos'],
+        'tiempo': time.time() - start_time
+    }
+
+
+def verificar_distancias(grafo, origen, resultado_delta, tolerancia=1e-6):
+    """
+    VALIDA las distancias uno-a-todos de delta-stepping contra Dijkstra
+    (PathAlgorithms.isocrona con radio infinito).
+
+    Returns:
+        dict con distancias_iguales, nodos_distintos, max_diferencia
+    """
+    csr = obtener_csr(grafo)
+    referencia = np.full(csr.num_nodos, np.inf)
+    isocrona = PathAlgorithms().isocrona(grafo, origen, float('inf'))
+    referencia[[csr.indice[nodo] for nodo in isocrona['nodos']]] = isocrona['distancias']
+
+    dist = resultado_delta['distancias']
+    ambas_inf = np.isinf(referencia) & np.isinf(dist)
+    # Inalcanzables en ambas: diferencia 0 (restar inf - inf daría NaN)
+    diferencia = np.zeros(len(dist))
+    diferencia[~ambas_inf] = np.abs(referencia[~ambas_inf] - dist[~ambas_inf])
+    distintos = diferencia >= tolerancia
+
+    return {
+        'distancias_iguales': not distintos.any(),
+        'nodos_distintos': int(distintos.sum()),
+        'max_diferencia': float(diferencia.max()) if len(diferencia) else 0.0
+    }
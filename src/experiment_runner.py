@@ -1,13 +1,32 @@
+import os
 import random
 import time
 import tracemalloc
 import pandas as pd
 
 from algorithms import PathAlgorithms
+from bucket_queue import dijkstra_cubetas, astar_cubetas
+from delta_stepping import delta_stepping_ruta
+from graph_arrays import obtener_csr
+from graph_creator import cuantizar_pesos
+from hub_labels import etiquetas_hub_distancia, etiquetas_hub_ruta, obtener_etiquetas
+from overlay import construir_overlay, obtener_overlay, overlay_ruta
+from query_sampler import MuestreadorConsultas
+from results_writer import EscritorResultados, calcular_estadisticas_por_lotes
+
+# Algoritmos que trabajan con 'peso_entero' (ver cuantizar_pesos)
+ALGORITMOS_CUANTIZADOS = ("dijkstra_cubetas", "astar_cubetas")
 
 # ------------------ medir_tiempo_y_memoria ------------------
 
 
+def longitud_real(grafo, ruta):
+    """Longitud de una ruta con los pesos reales ('weight'); inf si está vacía"""
+    if not ruta:
+        return float("inf")
+    return sum(grafo[u][v].get('weight', 1) for u, v in zip(ruta, ruta[1:]))
+
+
 def medir_tiempo_y_memoria(algoritmos, grafo, origen, destino, nombre_algoritmo):
     """
     Ejecuta un algoritmo (Dijkstra, A* o Bidireccional) midiendo:
@@ -25,6 +44,18 @@ def medir_tiempo_y_memoria(algoritmos, grafo, origen, destino, nombre_algoritmo)
         func = algoritmos.astar_con_heuristica
     elif nombre_algoritmo == "bidireccional":
         func = algoritmos.dijkstra_bidireccional
+    elif nombre_algoritmo == "dijkstra_cubetas":
+        func = dijkstra_cubetas
+    elif nombre_algoritmo == "astar_cubetas":
+        func = astar_cubetas
+    elif nombre_algoritmo == "delta_stepping":
+        func = delta_stepping_ruta
+    elif nombre_algoritmo == "overlay":
+        func = overlay_ruta
+    elif nombre_algoritmo == "hub_labels":
+        func = etiquetas_hub_ruta  # Distancia + recuperación de la ruta
+    elif nombre_algoritmo == "hub_labels_distancia":
+        func = etiquetas_hub_distancia  # Sólo la consulta de distancia
     else:
         raise ValueError(f"Algoritmo desconocido: {nombre_algoritmo}")
 
@@ -47,42 +78,230 @@ def medir_tiempo_y_memoria(algoritmos, grafo, origen, destino, nombre_algoritmo)
         "tiempo_interno_algoritmo": resultado["tiempo"],
         # medido externamente por ROL 3
         "tiempo_medido_experimento": t1 - t0,
-        "memoria_peak_KB": peak / 1024.0                    # pico de memoria en KB
+        "memoria_peak_KB": peak / 1024.0,                   # pico de memoria en KB
+        # La distancia de los algoritmos cuantizados está en unidades
+        # enteras; para validarlos se usa la longitud real de su ruta
+        "longitud_ruta_real": longitud_real(grafo, resultado["ruta"])
+        if nombre_algoritmo in ALGORITMOS_CUANTIZADOS else None
     }
     return registro
 
 
+# ------------------ preparar_indices ------------------
+
+def preparar_indices(grafo, nombres_algoritmos):
+    """
+    Construye antes de medir las estructuras que algunos algoritmos crean
+    en su primera consulta (CSR, overlay, etiquetas de hubs), para que ese costo no caiga en
+    el tiempo ni en la memoria del primer caso.
+
+    Devuelve {algoritmo: tiempo de preprocesamiento en segundos} para los
+    algoritmos que lo tienen.
+    """
+    tiempos = {}
+    hubs = [nombre for nombre in ("hub_labels", "hub_labels_distancia") if nombre in nombres_algoritmos]
+    if hubs or any(nombre in ("delta_stepping", "overlay") for nombre in nombres_algoritmos):
+        obtener_csr(grafo)
+    if "overlay" in nombres_algoritmos:
+        overlay = obtener_overlay(grafo)
+        tiempos["overlay"] = overlay.tiempo_particion + overlay.tiempo_personalizacion
+    if hubs:
+        construccion = obtener_etiquetas(grafo).estadisticas()["tiempo_construccion"]
+        tiempos.update(dict.fromkeys(hubs, construccion))
+    return tiempos
+
+
 # ------------------ ejecutar_todos_los_casos ------------------
 
-def ejecutar_todos_los_casos(grafo, num_casos=30, semilla=42):
+def generar_consultas(grafo, num_casos=30, semilla=42, estrategia="uniforme", metrica="euclidiana"):
+    """
+    Genera los pares (origen, destino, estrato) de un experimento.
+
+    - "uniforme": pares al azar con random.sample (pueden ser inalcanzables)
+    - "misma_componente", "estratificado", "rango_dijkstra": ver
+      MuestreadorConsultas, que precalcula las componentes una vez
+    """
+    if estrategia == "uniforme":
+        random.seed(semilla)
+        nodos = list(grafo.nodes())
+        return [tuple(random.sample(nodos, 2)) + (None,) for _ in range(num_casos)]
+
+    muestreador = MuestreadorConsultas(grafo, semilla=semilla)
+    return muestreador.muestrear(num_casos, estrategia, metrica)
+
+
+def ejecutar_todos_los_casos(grafo, num_casos=30, semilla=42, estrategia="uniforme", metrica="euclidiana",
+                             nombres_algoritmos=("dijkstra", "astar", "bidireccional"),
+                             directorio_salida=None, tamano_lote=1000):
     """
     Genera automáticamente varios pares (origen, destino) y
-    ejecuta los 3 algoritmos para cada par.
+    ejecuta los algoritmos de 'nombres_algoritmos' (por defecto los 3
+    originales) para cada par.
+
+    'estrategia' y 'metrica' eligen el muestreo (ver generar_consultas);
+    la columna "estrato" guarda la clase de dificultad de cada caso.
+
+    Los índices que requieren preprocesamiento se construyen antes de
+    medir (ver preparar_indices); su costo va en la columna
+    "tiempo_preprocesamiento" y no en el tiempo por consulta.
+
+    Si se da 'directorio_salida', los registros se escriben por lotes de
+    'tamano_lote' (Parquet si hay pyarrow, CSV si no) en vez de acumularse
+    en memoria. Los pares (caso_id, algoritmo) ya guardados se saltan, así
+    que repetir la llamada con la misma semilla reanuda una corrida
+    interrumpida.
 
-    Devuelve un DataFrame con TODOS los resultados.
+    Devuelve un DataFrame con TODOS los resultados, o la ruta del
+    directorio si se escribió a disco (calcular_estadisticas acepta ambos).
     """
-    random.seed(semilla)
-    nodos = list(grafo.nodes())
+    cuantizados = [nombre for nombre in nombres_algoritmos if nombre in ALGORITMOS_CUANTIZADOS]
+    if cuantizados and grafo.graph.get('resolucion') is None:
+        raise ValueError(f"Algoritmos cuantizados ({', '.join(cuantizados)}) requieren un grafo cuantizado: "
+                         "usar cuantizar_pesos(grafo, resolucion) o crear_grafo(..., resolucion=...)")
+
+    consultas = generar_consultas(grafo, num_casos, semilla, estrategia, metrica)
     algoritmos = PathAlgorithms()
+    tiempos_preprocesamiento = preparar_indices(grafo, nombres_algoritmos)
 
+    escritor = None
+    if directorio_salida is not None:
+        escritor = EscritorResultados(directorio_salida, tamano_lote)
     registros = []
 
-    for i in range(num_casos):
-        # Elegir origen y destino distintos al azar
-        origen, destino = random.sample(nodos, 2)
+    try:
+        for i, (origen, destino, estrato) in enumerate(consultas):
+            registros_caso = []
+            for nombre_alg in nombres_algoritmos:
+                if escritor is not None and escritor.ya_hecho(i, nombre_alg):
+                    continue
+                reg = medir_tiempo_y_memoria(
+                    algoritmos, grafo, origen, destino, nombre_alg)
+                reg["caso_id"] = i
+                reg["estrato"] = estrato
+                reg["tiempo_preprocesamiento"] = tiempos_preprocesamiento.get(nombre_alg)
+                reg["num_nodos_grafo"] = grafo.number_of_nodes()
+                reg["num_aristas_grafo"] = grafo.number_of_edges()
+                registros_caso.append(reg)
+
+            # Validar cada algoritmo contra la distancia de Dijkstra (si se
+            # ejecutó, en esta corrida o en una anterior ya guardada)
+            referencia = next(
+                (r["distancia"] for r in registros_caso if r["algoritmo"] == "dijkstra"), None)
+            if referencia is None and escritor is not None:
+                referencia = escritor.distancia_guardada(i, "dijkstra")
+            for reg in registros_caso:
+                distancia = reg["distancia"]
+                if reg["longitud_ruta_real"] is not None:
+                    distancia = reg["longitud_ruta_real"]
+                reg["coincide_con_dijkstra"] = None if referencia is None else bool(
+                    distancia == referencia or abs(distancia - referencia) < 1e-6)
 
-        for nombre_alg in ["dijkstra", "astar", "bidireccional"]:
-            reg = medir_tiempo_y_memoria(
-                algoritmos, grafo, origen, destino, nombre_alg)
-            reg["caso_id"] = i
-            reg["num_nodos_grafo"] = grafo.number_of_nodes()
-            reg["num_aristas_grafo"] = grafo.number_of_edges()
-            registros.append(reg)
+            if escritor is None:
+                registros.extend(registros_caso)
+            else:
+                for reg in registros_caso:
+                    escritor.agregar(reg)
+    finally:
+        if escritor is not None:
+            escritor.vaciar()
 
+    if escritor is not None:
+        return directorio_salida
     df_resultados = pd.DataFrame(registros)
     return df_resultados
 
 
+# ------------------ medir_error_cuantizacion ------------------
+
+def medir_error_cuantizacion(grafo, resoluciones, num_casos=30, semilla=42):
+    """
+    Compara Dijkstra con cola de cubetas sobre pesos cuantizados contra
+    dijkstra_con_contador sobre los pesos reales, para cada resolución.
+
+    - error_distancia: distancia cuantizada - distancia real óptima
+    - error_ruta: longitud real de la ruta cuantizada - distancia óptima
+      (cuánto peor es la ruta elegida con pesos enteros)
+
+    Devuelve un DataFrame con un registro por (resolución, caso).
+    """
+    consultas = generar_consultas(grafo, num_casos, semilla, "misma_componente")
+    algoritmos = PathAlgorithms()
+    referencias = [algoritmos.dijkstra_con_contador(grafo, o, d) for o, d, _ in consultas]
+
+    registros = []
+    for resolucion in resoluciones:
+        grafo_entero = cuantizar_pesos(grafo.copy(), resolucion)
+
+        for i, ((origen, destino, _), ref) in enumerate(zip(consultas, referencias)):
+            res = dijkstra_cubetas(grafo_entero, origen, destino)
+            longitud = longitud_real(grafo, res["ruta"])
+            registros.append({
+                "resolucion": resolucion,
+                "caso_id": i,
+                "distancia_real": ref["distancia"],
+                "distancia_cuantizada": res["distancia"],
+                "error_distancia": res["distancia"] - ref["distancia"],
+                "error_ruta": longitud - ref["distancia"],
+                "error_ruta_relativo": (longitud - ref["distancia"]) / ref["distancia"]
+                if ref["distancia"] > 0 else 0.0,
+                "peso_entero_maximo": max((d["peso_entero"] for _, _, d in grafo_entero.edges(data=True)),
+                                          default=0),
+                "tiempo_float": ref["tiempo"],
+                "tiempo_cubetas": res["tiempo"],
+                "nodos_expandidos_float": ref["nodos_expandidos"],
+                "nodos_expandidos_cubetas": res["nodos_expandidos"]
+            })
+
+    return pd.DataFrame(registros)
+
+
+# ------------------ medir_overlay ------------------
+
+def medir_overlay(grafo, valores_celdas=(4, 16, 64), num_casos=30, semilla=42, num_cambios=10):
+    """
+    Para cada número de celdas reporta el costo de preprocesamiento del
+    overlay (partición + personalización), su memoria, el tiempo de
+    re-personalizar tras cambiar 'num_cambios' pesos y la aceleración de
+    las consultas respecto a dijkstra_con_contador.
+
+    Devuelve un DataFrame con un registro por número de celdas.
+    """
+    consultas = generar_consultas(grafo, num_casos, semilla, "misma_componente")
+    algoritmos = PathAlgorithms()
+    referencias = [algoritmos.dijkstra_con_contador(grafo, o, d) for o, d, _ in consultas]
+    rng = random.Random(semilla)
+
+    registros = []
+    for num_celdas in valores_celdas:
+        overlay, tiempo_particion = construir_overlay(grafo, num_celdas)
+        resultados = [overlay.buscar(o, d) for o, d, _ in consultas]
+
+        # Re-personalización: se escalan algunos pesos al azar
+        aristas = rng.sample(list(grafo.edges(data='weight', default=1)),
+                             min(num_cambios, grafo.number_of_edges()))
+        cambio = overlay.actualizar_pesos({(u, v): w * 1.5 for u, v, w in aristas})
+        overlay.actualizar_pesos({(u, v): w for u, v, w in aristas})
+
+        tiempo_overlay = sum(r["tiempo"] for r in resultados) / len(resultados)
+        tiempo_dijkstra = sum(r["tiempo"] for r in referencias) / len(referencias)
+        registro = overlay.estadisticas()
+        registro.update({
+            "tiempo_particion": tiempo_particion,
+            "tiempo_repersonalizacion": cambio["tiempo"],
+            "celdas_repersonalizadas": len(cambio["celdas_recalculadas"]),
+            "tiempo_consulta_promedio": tiempo_overlay,
+            "tiempo_dijkstra_promedio": tiempo_dijkstra,
+            "aceleracion": tiempo_dijkstra / tiempo_overlay if tiempo_overlay > 0 else float("inf"),
+            "expansiones_promedio": sum(r["nodos_expandidos"] for r in resultados) / len(resultados),
+            "expansiones_dijkstra_promedio": sum(r["nodos_expandidos"] for r in referencias) / len(referencias),
+            "distancias_iguales": all(abs(r["distancia"] - ref["distancia"]) < 1e-6
+                                      for r, ref in zip(resultados, referencias))
+        })
+        registros.append(registro)
+
+    return pd.DataFrame(registros)
+
+
 # ------------------ generar_csv_resultados ------------------
 
 def generar_csv_resultados(df_resultados, nombre_archivo="resultados_experimentos.csv"):
@@ -95,19 +314,28 @@ def generar_csv_resultados(df_resultados, nombre_archivo="resultados_experimento
 
 # ------------------ calcular_estadisticas ------------------
 
-def calcular_estadisticas(df_resultados):
+def calcular_estadisticas(df_resultados, por_estrato=False):
     """
-    Calcula estadísticas agregadas por algoritmo:
+    Calcula estadísticas agregadas por algoritmo (y por estrato si
+    por_estrato=True):
     - tiempo promedio
     - desviación estándar del tiempo
     - promedio de nodos expandidos
     - promedio de memoria usada
 
+    'df_resultados' puede ser también el directorio escrito por
+    ejecutar_todos_los_casos(directorio_salida=...): en ese caso se
+    agrega lote por lote sin cargar todos los resultados en memoria.
+
     Devuelve otro DataFrame con el resumen.
     """
+    if isinstance(df_resultados, (str, os.PathLike)):
+        return calcular_estadisticas_por_lotes(df_resultados, por_estrato)
+
+    grupos = ["algoritmo", "estrato"] if por_estrato else "algoritmo"
     resumen = (
         df_resultados
-        .groupby("algoritmo")
+        .groupby(grupos, dropna=False)  # estrato es None en "uniforme" y "misma_componente"
         .agg(
             tiempo_promedio=("tiempo_medido_experimento", "mean"),
             tiempo_std=("tiempo_medido_experimento", "std"),
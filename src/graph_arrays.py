@@ -0,0 +1,177 @@
+# -----------------------------------Representación del grafo en arreglos-----------------------
+import numpy as np
+
+
+def extraer_aristas(G, atributo='weight'):
+    """
+    Convierte las aristas de un grafo de NetworkX en arreglos NumPy.
+
+    Los nodos se numeran 0..n-1 en el orden de G.nodes(); las aristas sin
+    peso toman 1, igual que en PathAlgorithms.
+
+    Returns:
+        tuple (nodos, origenes, destinos, pesos) donde 'nodos' es la lista
+        de ids originales y los demás son arreglos de longitud m.
+    """
+    nodos = list(G.nodes())
+    indice = {nodo: i for i, nodo in enumerate(nodos)}
+    m = G.number_of_edges()
+
+    origenes = np.empty(m, dtype=np.int64)
+    destinos = np.empty(m, dtype=np.int64)
+    pesos = np.empty(m, dtype=np.float64)
+    for k, (u, v, data) in enumerate(G.edges(data=True)):
+        origenes[k] = indice[u]
+        destinos[k] = indice[v]
+        pesos[k] = data.get(atributo, 1)
+
+    return nodos, origenes, destinos, pesos
+
+
+def construir_csr(num_nodos, origenes, destinos, pesos):
+    """
+    Ordena una lista de aristas dirigidas en formato CSR.
+
+    Returns:
+        tuple (indptr, indices, pesos): los vecinos de i son
+        indices[indptr[i]:indptr[i + 1]]
+    """
+    orden = np.argsort(origenes, kind='stable')
+    conteos = np.bincount(origenes, minlength=num_nodos)
+    indptr = np.zeros(num_nodos + 1, dtype=np.int64)
+    np.cumsum(conteos, out=indptr[1:])
+    return indptr, destinos[orden].astype(np.int64), pesos[orden].astype(np.float64)
+
+
+class GrafoCSR:  # Adyacencia compacta sobre arreglos NumPy para búsquedas por índice
+
+    def __init__(self, nodos, indptr, indices, pesos, pos=None, inversa=None):
+        """
+        Args:
+            nodos: ids originales; el nodo de índice i es nodos[i]
+            indptr, indices, pesos: adyacencia (arcos salientes) en formato CSR
+            pos: arreglo (n, 2) de coordenadas o None
+            inversa: tupla (indptr, indices, pesos) de los arcos entrantes
+                para grafos dirigidos; None si el grafo es no dirigido
+        """
+        self.nodos = list(nodos)
+        self.indice = {nodo: i for i, nodo in enumerate(self.nodos)}
+        self.indptr = indptr
+        self.indices = indices
+        self.pesos = pesos
+        self.pos = pos
+        self.dirigido = inversa is not None
+
+        # En un grafo no dirigido la adyacencia inversa es la misma (sin copia)
+        if inversa is None:
+            inversa = (indptr, indices, pesos)
+        self.indptr_inv, self.indices_inv, self.pesos_inv = inversa
+
+    @classmethod
+    def desde_networkx(cls, G):
+        """
+        Construye la representación CSR de un grafo de NetworkX. Para un
+        DiGraph precalcula también la adyacencia inversa (arcos entrantes).
+        """
+        nodos, origenes, destinos, pesos = extraer_aristas(G)
+
+        if G.is_directed():
+            indptr, indices, pesos_csr = construir_csr(len(nodos), origenes, destinos, pesos)
+            inversa = construir_csr(len(nodos), destinos, origenes, pesos)
+        else:
+            # Cada arista no dirigida se guarda en ambos sentidos
+            todos_origenes = np.concatenate([origenes, destinos])
+            todos_destinos = np.concatenate([destinos, origenes])
+            todos_pesos = np.concatenate([pesos, pesos])
+            indptr, indices, pesos_csr = construir_csr(
+                len(nodos), todos_origenes, todos_destinos, todos_pesos)
+            inversa = None
+
+        pos = None
+        if nodos and all('pos' in G.nodes[n] for n in nodos):
+            pos = np.array([G.nodes[n]['pos'] for n in nodos], dtype=np.float64)
+
+        return cls(nodos, indptr, indices, pesos_csr, pos, inversa)
+
+    @property
+    def num_nodos(self):
+        return len(self.nodos)
+
+    @property
+    def num_arcos(self):
+        return len(self.indices)
+
+    def vecinos(self, i):
+        """Índices y pesos de los arcos que salen del nodo de índice i"""
+        inicio, fin = self.indptr[i], self.indptr[i + 1]
+        return self.indices[inicio:fin], self.pesos[inicio:fin]
+
+    def predecesores(self, i):
+        """Índices y pesos de los arcos que entran al nodo de índice i"""
+        inicio, fin = self.indptr_inv[i], self.indptr_inv[i + 1]
+        return self.indices_inv[inicio:fin], self.pesos_inv[inicio:fin]
+
+    def ruta_a_ids(self, ruta_indices):
+        """Traduce una ruta de índices a los ids originales"""
+        return [self.nodos[i] for i in ruta_indices]
+
+    def guardar(self, nombre_archivo):
+        """
+        Guarda los arreglos en un .npz (sin pickle). Cargarlo sólo requiere
+        NumPy, sin NetworkX ni pandas.
+        """
+        np.savez(nombre_archivo, **self._arreglos_guardables())
+
+    def _arreglos_guardables(self):
+        """Arreglos con nombre que escribe guardar(); las subclases agregan los suyos"""
+        nodos = np.asarray(self.nodos)
+        if nodos.dtype == object:
+            raise ValueError("Sólo se pueden guardar ids de nodo numéricos o de texto")
+        arreglos = {'nodos': nodos, 'indptr': self.indptr, 'indices': self.indices, 'pesos': self.pesos}
+        if self.pos is not None:
+            arreglos['pos'] = self.pos
+        if self.dirigido:
+            arreglos['indptr_inv'] = self.indptr_inv
+            arreglos['indices_inv'] = self.indices_inv
+            arreglos['pesos_inv'] = self.pesos_inv
+        return arreglos
+
+    @classmethod
+    def cargar(cls, nombre_archivo):
+        """Carga un grafo guardado con guardar()"""
+        with np.load(nombre_archivo, allow_pickle=False) as datos:
+            inversa = None
+            if 'indptr_inv' in datos:
+                inversa = (datos['indptr_inv'], datos['indices_inv'], datos['pesos_inv'])
+            return cls(datos['nodos'].tolist(), datos['indptr'], datos['indices'], datos['pesos'],
+                       datos['pos'] if 'pos' in datos else None, inversa)
+
+
+# Estructuras derivadas que se cachean en G.graph (ver invalidar_caches)
+CACHES_DERIVADOS = ('csr', 'overlay', 'etiquetas_hub', 'indice_espacial')
+
+
+def invalidar_caches(G):
+    """
+    Descarta las estructuras cacheadas en G.graph (CSR, overlay,
+    etiquetas de hubs e índice espacial). La firma de las cachés sólo
+    cuenta nodos y aristas: después de cambiar pesos o posiciones sin
+    agregar ni quitar aristas hay que llamar a esta función, o las
+    consultas seguirán usando los valores viejos.
+    """
+    for clave in CACHES_DERIVADOS:
+        G.graph.pop(clave, None)
+
+
+def obtener_csr(G):
+    """
+    Devuelve el GrafoCSR de G, construyéndolo una sola vez y guardándolo
+    en G.graph['csr']. Se reconstruye si cambió el número de nodos o aristas;
+    un cambio de pesos no se detecta (usar invalidar_caches).
+    """
+    firma = (G.number_of_nodes(), G.number_of_edges())
+    cache = G.graph.get('csr')
+    if cache is None or cache[0] != firma:
+        cache = (firma, GrafoCSR.desde_networkx(G))
+        G.graph['csr'] = cache
+    return cache[1]
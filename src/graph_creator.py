@@ -2,7 +2,9 @@
 import networkx as nx
 import numpy as np
 import math
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from graph_arrays import extraer_aristas
 
 
 def calcular_distancia_euclidiana(pos1, pos2):
@@ -10,12 +12,13 @@ def calcular_distancia_euclidiana(pos1, pos2):
     return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
 
 
-def crear_grafo(num_nodos, tamano_mapa, radio_conexion):
+def crear_grafo(num_nodos, tamano_mapa, radio_conexion, resolucion=None):
     """
     Crea un grafo geométrico aleatorio.
 
     Los nodos se esparcen en un cuadrado de 'tamano_mapa' x 'tamano_mapa'.
     Dos nodos se conectan si su distancia es menor o igual a 'radio_conexion'.
+    Si se da 'resolucion', además se cuantizan los pesos (ver cuantizar_pesos).
     """
     G = nx.Graph()
 
@@ -41,6 +44,27 @@ def crear_grafo(num_nodos, tamano_mapa, radio_conexion):
             if distancia <= radio_conexion:
                 G.add_edge(i, j, weight=distancia)
 
+    if resolucion is not None:
+        cuantizar_pesos(G, resolucion)
+
+    return G
+
+
+def cuantizar_pesos(G, resolucion):
+    """
+    Agrega a cada arista el atributo 'peso_entero' = ceil(weight / resolucion)
+    para los algoritmos con cola de cubetas (bucket_queue).
+
+    Se redondea hacia arriba para que peso_entero * resolucion nunca sea
+    menor que el peso real: así la heurística euclidiana cuantizada sigue
+    siendo consistente. La resolución queda en G.graph['resolucion'].
+    """
+    if resolucion <= 0:
+        raise ValueError("La resolución debe ser positiva")
+
+    for u, v, data in G.edges(data=True):
+        data['peso_entero'] = int(math.ceil(data.get('weight', 1) / resolucion))
+    G.graph['resolucion'] = resolucion
     return G
 
 
@@ -73,6 +97,208 @@ def validar_grafo(G):
     print("--- Validación Terminada ---")
 
 
+def calcular_componentes(num_nodos, origenes, destinos):
+    """
+    Calcula las componentes conexas con un union-find sobre arreglos.
+
+    En cada ronda, cada arista engancha la raíz mayor bajo la menor
+    (np.minimum.at) y después se comprimen los caminos saltando punteros
+    hasta que padre[padre] == padre. Todo el trabajo es vectorizado.
+
+    Returns:
+        dict con num_componentes, tamanos (por componente),
+        componente_de (componente de cada índice de nodo)
+    """
+    padre = np.arange(num_nodos, dtype=np.int64)
+    origenes = np.asarray(origenes, dtype=np.int64)
+    destinos = np.asarray(destinos, dtype=np.int64)
+
+    while True:
+        raiz_u = padre[origenes]
+        raiz_v = padre[destinos]
+        distintas = raiz_u != raiz_v
+        if not distintas.any():
+            break
+
+        # Enganchar la raíz mayor bajo la menor
+        mayor = np.maximum(raiz_u[distintas], raiz_v[distintas])
+        menor = np.minimum(raiz_u[distintas], raiz_v[distintas])
+        np.minimum.at(padre, mayor, menor)
+
+        # Compresión de caminos (pointer jumping)
+        while True:
+            abuelo = padre[padre]
+            if np.array_equal(abuelo, padre):
+                break
+            padre = abuelo
+
+    raices, componente_de = np.unique(padre, return_inverse=True)
+    tamanos = np.bincount(componente_de, minlength=len(raices))
+
+    return {
+        'num_componentes': len(raices),
+        'tamanos': tamanos,
+        'componente_de': componente_de
+    }
+
+
+def mismo_componente(componentes, origen, destino):
+    """Indica en O(1) si origen y destino pueden estar conectados"""
+    indice = componentes['indice_nodo']
+    componente_de = componentes['componente_de']
+    return componente_de[indice[origen]] == componente_de[indice[destino]]
+
+
+def _revisar_pesos(pesos):
+    """Cuenta pesos NaN, infinitos y negativos"""
+    return {
+        'pesos_nan': int(np.isnan(pesos).sum()),
+        'pesos_infinitos': int(np.isinf(pesos).sum()),
+        'pesos_negativos': int((pesos < 0).sum())
+    }
+
+
+def _revisar_aristas(num_nodos, origenes, destinos, pesos, dirigido):
+    """
+    Cuenta auto-bucles, aristas duplicadas y pares con pesos asimétricos.
+    En un grafo dirigido u→v y v→u con pesos distintos son datos válidos
+    (p. ej. calles con pendiente): se informan en 'arcos_peso_asimetrico'
+    y no cuentan como error.
+    """
+    auto_bucles = int((origenes == destinos).sum())
+
+    # En un grafo no dirigido (u, v) y (v, u) son la misma arista
+    if dirigido:
+        claves = origenes * num_nodos + destinos
+    else:
+        claves = (np.minimum(origenes, destinos) * num_nodos +
+                  np.maximum(origenes, destinos))
+    aristas_duplicadas = len(claves) - len(np.unique(claves))
+
+    # Aristas cuyo sentido inverso existe con otro peso
+    directas = origenes * num_nodos + destinos
+    inversas = destinos * num_nodos + origenes
+    orden = np.argsort(directas, kind='stable')
+    directas_ordenadas = directas[orden]
+    posiciones = np.searchsorted(directas_ordenadas, inversas)
+    posiciones = np.minimum(posiciones, max(len(orden) - 1, 0))
+    existe_inversa = (len(orden) > 0) & (directas_ordenadas[posiciones] == inversas)
+    existe_inversa &= origenes != destinos
+    peso_inverso = pesos[orden][posiciones]
+    asimetricos = int((existe_inversa & (peso_inverso != pesos)).sum())
+
+    return {
+        'auto_bucles': auto_bucles,
+        'aristas_duplicadas': int(aristas_duplicadas),
+        'pesos_asimetricos': 0 if dirigido else asimetricos,
+        'arcos_peso_asimetrico': asimetricos if dirigido else 0
+    }
+
+
+def validar_aristas(num_nodos, origenes, destinos, pesos, dirigido=False, num_hilos=1):
+    """
+    Valida una lista de aristas en forma de arreglos NumPy.
+
+    Revisa pesos NaN, infinitos y negativos, auto-bucles, aristas
+    duplicadas y pesos asimétricos, y calcula las componentes conexas.
+    Con num_hilos > 1 las tres revisiones corren en paralelo (NumPy
+    libera el GIL en las operaciones pesadas).
+
+    Returns:
+        dict con los conteos de cada problema, 'valido' y 'componentes'
+    """
+    origenes = np.asarray(origenes, dtype=np.int64)
+    destinos = np.asarray(destinos, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.float64)
+
+    with ThreadPoolExecutor(max_workers=max(1, num_hilos)) as executor:
+        f_pesos = executor.submit(_revisar_pesos, pesos)
+        f_aristas = executor.submit(
+            _revisar_aristas, num_nodos, origenes, destinos, pesos, dirigido)
+        f_componentes = executor.submit(
+            calcular_componentes, num_nodos, origenes, destinos)
+
+        reporte = {'num_nodos': num_nodos, 'num_aristas': len(origenes)}
+        reporte.update(f_pesos.result())
+        reporte.update(f_aristas.result())
+        componentes = f_componentes.result()
+
+    reporte['valido'] = all(reporte[clave] == 0 for clave in (
+        'pesos_nan', 'pesos_infinitos', 'pesos_negativos',
+        'auto_bucles', 'aristas_duplicadas', 'pesos_asimetricos'))
+    reporte['componentes'] = componentes
+    return reporte
+
+
+def validar_grafo_vectorizado(G, num_hilos=1, verbose=True):
+    """
+    Versión vectorizada de validar_grafo para grafos grandes.
+
+    Trabaja sobre los arreglos de aristas en lugar de iterar en Python y,
+    a diferencia de nx.is_connected, devuelve las componentes: sus tamaños
+    y el índice nodo→componente, para descartar pares inalcanzables en
+    O(1) con mismo_componente().
+    """
+    nodos, origenes, destinos, pesos = extraer_aristas(G)
+    reporte = validar_aristas(len(nodos), origenes, destinos, pesos,
+                              dirigido=G.is_directed(), num_hilos=num_hilos)
+    reporte['componentes']['indice_nodo'] = {
+        nodo: i for i, nodo in enumerate(nodos)}
+
+    if verbose:
+        print("--- Iniciando Validación Vectorizada ---")
+        problemas = [
+            ('pesos_nan', "pesos NaN"),
+            ('pesos_infinitos', "pesos infinitos"),
+            ('pesos_negativos', "pesos negativos"),
+            ('auto_bucles', "auto-bucles"),
+            ('aristas_duplicadas', "aristas duplicadas"),
+            ('pesos_asimetricos', "aristas con peso asimétrico"),
+        ]
+        for clave, descripcion in problemas:
+            if reporte[clave]:
+                print(f"ERROR: {reporte[clave]} {descripcion}.")
+        if reporte['arcos_peso_asimetrico']:
+            print(f"INFO: {reporte['arcos_peso_asimetrico']} arcos con peso distinto al de su sentido inverso.")
+        if reporte['valido']:
+            print("Validación 1/2: OK. Pesos y aristas correctos.")
+
+        componentes = reporte['componentes']
+        if componentes['num_componentes'] <= 1:
+            conexo = "débilmente conexo" if G.is_directed() else "conexo"
+            print(f"Validación 2/2: OK. El grafo es {conexo}.")
+        else:
+            print(f"ADVERTENCIA: El grafo tiene {componentes['num_componentes']} componentes "
+                  f"(la mayor con {componentes['tamanos'].max()} nodos).")
+        print("--- Validación Terminada ---")
+
+    return reporte
+
+
+def grafo_desde_dataframe(df, dirigido=False):
+    """
+    Construye el grafo a partir de un DataFrame con columnas
+    nodo_origen, nodo_destino, weight (el formato de guardar_grafo_csv).
+
+    Con dirigido=True se crea un nx.DiGraph: cada fila es un arco de un
+    solo sentido y NetworkX mantiene además el índice de arcos entrantes
+    (G.predecessors) que usa la búsqueda backward.
+    """
+    columnas = ['nodo_origen', 'nodo_destino', 'weight']
+    if not all(col in df.columns for col in columnas):
+        raise ValueError("El CSV debe contener las columnas: nodo_origen, nodo_destino, weight")
+
+    return nx.from_pandas_edgelist(
+        df, 'nodo_origen', 'nodo_destino', ['weight'],
+        create_using=nx.DiGraph if dirigido else nx.Graph)
+
+
+def cargar_grafo_csv(nombre_archivo, dirigido=False):
+    """Carga un grafo guardado con guardar_grafo_csv (ver grafo_desde_dataframe)"""
+    import pandas as pd  # Sólo aquí: crear y validar grafos no necesita pandas
+    return grafo_desde_dataframe(pd.read_csv(nombre_archivo), dirigido)
+
+
 def guardar_grafo_csv(G, nombre_archivo):
     """
     Exporta la lista de aristas del grafo a un archivo CSV.
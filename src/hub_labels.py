@@ -0,0 +1,287 @@
+# -----------------------------------Etiquetado por hubs (pruned landmark labeling)-----------------------
+import heapq
+import time
+
+import numpy as np
+
+from graph_arrays import obtener_csr
+
+INF = float('inf')
+
+
+def _compactar(etiquetas):
+    """Listas [(hub, dist), ...] por nodo → arreglos (offsets, hubs, distancias)"""
+    tamanos = np.array([len(e) for e in etiquetas], dtype=np.int64)
+    offsets = np.zeros(len(etiquetas) + 1, dtype=np.int64)
+    np.cumsum(tamanos, out=offsets[1:])
+    hubs = np.fromiter((h for e in etiquetas for h, _ in e), dtype=np.int64, count=int(offsets[-1]))
+    distancias = np.fromiter((d for e in etiquetas for _, d in e), dtype=np.float64, count=int(offsets[-1]))
+    return offsets, hubs, distancias
+
+
+def orden_por_cobertura(csr, num_muestras=32, semilla=0):
+    """
+    Orden de importancia aproximando la intermediación: suma, sobre árboles
+    de rutas más cortas desde raíces al azar, el tamaño del subárbol de cada
+    nodo. Los nodos que cubren muchas rutas quedan primero, lo que da
+    etiquetas mucho más pequeñas que ordenar por grado.
+    """
+    n = csr.num_nodos
+    indptr, indices, pesos = csr.indptr.tolist(), csr.indices.tolist(), csr.pesos.tolist()
+    rng = np.random.default_rng(semilla)
+    cobertura = np.zeros(n)
+
+    for raiz in rng.choice(n, size=min(num_muestras, n), replace=False).tolist():
+        dist = {raiz: 0.0}
+        pred = {}
+        asentados = []
+        cola = [(0.0, raiz)]
+        while cola:
+            d, u = heapq.heappop(cola)
+            if d > dist[u]:
+                continue
+            asentados.append(u)
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if d + pesos[k] < dist.get(v, INF):
+                    dist[v] = d + pesos[k]
+                    pred[v] = u
+                    heapq.heappush(cola, (d + pesos[k], v))
+
+        # Tamaños de subárbol: de las hojas hacia la raíz
+        subarbol = dict.fromkeys(asentados, 1)
+        for u in reversed(asentados):
+            if u in pred:
+                subarbol[pred[u]] += subarbol[u]
+        for u, tamano in subarbol.items():
+            cobertura[u] += tamano
+
+    return np.argsort(-cobertura, kind='stable')
+
+
+class EtiquetasHub:  # Índice de distancias: cada consulta es un merge-join de dos etiquetas
+
+    def __init__(self, nodos, orden, salida, entrada=None, tiempo_construccion=0.0):
+        """
+        Args:
+            nodos: ids originales por índice
+            orden: índices de nodo en orden de importancia (el hub de rango
+                r es orden[r])
+            salida: (offsets, hubs, distancias) de las etiquetas de salida,
+                hubs = rangos ordenados de menor a mayor
+            entrada: igual para las etiquetas de entrada (grafos dirigidos);
+                None si el grafo es no dirigido
+        """
+        self.nodos = list(nodos)
+        self.indice = {nodo: i for i, nodo in enumerate(self.nodos)}
+        self.orden = np.asarray(orden, dtype=np.int64)
+        self.salida = salida
+        self.entrada = salida if entrada is None else entrada
+        self.dirigido = entrada is not None
+        self.tiempo_construccion = tiempo_construccion
+
+    # ------------------ construcción ------------------
+
+    @classmethod
+    def construir(cls, csr, orden=None):
+        """
+        Pruned landmark labeling: se corre un Dijkstra desde cada nodo en
+        orden de importancia (orden_por_cobertura por defecto) y se poda todo
+        nodo cuya distancia ya se responde con las etiquetas existentes.
+        En grafos dirigidos hay una pasada forward (etiquetas de entrada)
+        y otra sobre los arcos entrantes (etiquetas de salida).
+        """
+        start_time = time.perf_counter()
+        n = csr.num_nodos
+        if orden is None:
+            orden = orden_por_cobertura(csr)
+
+        adelante = (csr.indptr.tolist(), csr.indices.tolist(), csr.pesos.tolist())
+        atras = adelante
+        if csr.dirigido:
+            atras = (csr.indptr_inv.tolist(), csr.indices_inv.tolist(), csr.pesos_inv.tolist())
+
+        salida = [[] for _ in range(n)]
+        entrada = [[] for _ in range(n)] if csr.dirigido else salida
+        temporal = [INF] * n
+
+        def busqueda_podada(raiz, rango, adyacencia, propias, ajenas):
+            # propias: etiquetas de la raíz en el sentido de la búsqueda;
+            # ajenas: etiquetas que recibe cada nodo alcanzado
+            indptr, indices, pesos = adyacencia
+            for h, d in propias[raiz]:
+                temporal[h] = d
+
+            dist = {raiz: 0.0}
+            cola = [(0.0, raiz)]
+            while cola:
+                d, u = heapq.heappop(cola)
+                if d > dist[u]:
+                    continue
+                if min((temporal[h] + dh for h, dh in ajenas[u]), default=INF) <= d:
+                    continue  # Poda: las etiquetas ya cubren esta distancia
+                ajenas[u].append((rango, d))
+                for k in range(indptr[u], indptr[u + 1]):
+                    v = indices[k]
+                    nueva = d + pesos[k]
+                    if nueva < dist.get(v, INF):
+                        dist[v] = nueva
+                        heapq.heappush(cola, (nueva, v))
+
+            for h, _ in propias[raiz]:
+                temporal[h] = INF
+
+        for rango, raiz in enumerate(orden.tolist()):
+            busqueda_podada(raiz, rango, adelante, salida, entrada)
+            if csr.dirigido:
+                busqueda_podada(raiz, rango, atras, entrada, salida)
+
+        return cls(csr.nodos, orden, _compactar(salida),
+                   _compactar(entrada) if csr.dirigido else None,
+                   time.perf_counter() - start_time)
+
+    # ------------------ consultas ------------------
+
+    def _distancia_indices(self, s, t):
+        """Merge-join de la etiqueta de salida de s y la de entrada de t"""
+        offsets_s, hubs_s, dist_s = self.salida
+        offsets_t, hubs_t, dist_t = self.entrada
+        h_s = hubs_s[offsets_s[s]:offsets_s[s + 1]]
+        h_t = hubs_t[offsets_t[t]:offsets_t[t + 1]]
+        if len(h_s) == 0 or len(h_t) == 0:
+            return INF
+
+        posiciones = np.searchsorted(h_t, h_s)
+        np.minimum(posiciones, len(h_t) - 1, out=posiciones)
+        comunes = h_t[posiciones] == h_s
+        if not comunes.any():
+            return INF
+        d_s = dist_s[offsets_s[s]:offsets_s[s + 1]][comunes]
+        d_t = dist_t[offsets_t[t]:offsets_t[t + 1]][posiciones[comunes]]
+        return float((d_s + d_t).min())
+
+    def distancia(self, origen, destino):
+        """Distancia exacta entre dos ids de nodo (sin búsqueda en el grafo)"""
+        return self._distancia_indices(self.indice[origen], self.indice[destino])
+
+    def ruta(self, csr, origen, destino):
+        """
+        Recupera la ruta avanzando, desde el origen, por el vecino v que
+        cumple peso(u, v) + dist(v, destino) == dist(u, destino).
+
+        Returns:
+            dict con ruta, distancia, nodos_expandidos (consultas de
+            etiqueta hechas), tiempo
+        """
+        start_time = time.time()
+        s, t = self.indice[origen], self.indice[destino]
+        total = self._distancia_indices(s, t)
+        consultas = 1
+        ruta = []
+
+        if total < INF:
+            ruta = [s]
+            while ruta[-1] != t:
+                u = ruta[-1]
+                mejor = None
+                for k in range(csr.indptr[u], csr.indptr[u + 1]):
+                    v = int(csr.indices[k])
+                    resto_v = self._distancia_indices(v, t)
+                    consultas += 1
+                    if mejor is None or csr.pesos[k] + resto_v < mejor[0]:
+                        mejor = (csr.pesos[k] + resto_v, v)
+                ruta.append(mejor[1])
+            ruta = csr.ruta_a_ids(ruta)
+
+        return {
+            'ruta': ruta,
+            'distancia': total,
+            'nodos_expandidos': consultas,
+            'tiempo': time.time() - start_time
+        }
+
+    # ------------------ estadísticas y disco ------------------
+
+    def estadisticas(self):
+        """Tiempo de construcción y tamaño de las etiquetas"""
+        tamanos = np.diff(self.salida[0])
+        if self.dirigido:
+            tamanos = tamanos + np.diff(self.entrada[0])
+        arreglos = list(self.salida) + (list(self.entrada) if self.dirigido else [])
+        return {
+            'tiempo_construccion': self.tiempo_construccion,
+            'entradas_totales': int(tamanos.sum()),
+            'etiqueta_promedio': float(tamanos.mean()) if len(tamanos) else 0.0,
+            'etiqueta_maxima': int(tamanos.max()) if len(tamanos) else 0,
+            'memoria_KB': sum(a.nbytes for a in arreglos) / 1024.0
+        }
+
+    def guardar(self, nombre_archivo):
+        """Guarda el índice en un .npz (sin pickle)"""
+        nodos = np.asarray(self.nodos)
+        if nodos.dtype == object:
+            raise ValueError("Sólo se pueden guardar ids de nodo numéricos o de texto")
+        arreglos = {'nodos': nodos, 'orden': self.orden}
+        for nombre, (offsets, hubs, distancias) in [('salida', self.salida), ('entrada', self.entrada)]:
+            if nombre == 'entrada' and not self.dirigido:
+                continue
+            arreglos[f'{nombre}_offsets'] = offsets
+            arreglos[f'{nombre}_hubs'] = hubs
+            arreglos[f'{nombre}_distancias'] = distancias
+        np.savez_compressed(nombre_archivo, **arreglos)
+        print(f"Etiquetas guardadas exitosamente en '{nombre_archivo}'")
+
+    @classmethod
+    def cargar(cls, nombre_archivo):
+        """Carga un índice guardado con guardar()"""
+        with np.load(nombre_archivo, allow_pickle=False) as datos:
+            def etiquetas(nombre):
+                if f'{nombre}_offsets' not in datos:
+                    return None
+                return (datos[f'{nombre}_offsets'], datos[f'{nombre}_hubs'],
+                        datos[f'{nombre}_distancias'])
+
+            return cls(datos['nodos'].tolist(), datos['orden'],
+                       etiquetas('salida'), etiquetas('entrada'))
+
+
+def obtener_etiquetas(grafo):
+    """
+    Índice construido una vez por grafo y cacheado en
+    grafo.graph['etiquetas_hub']. Si cambian los pesos, llamar a
+    invalidar_caches(grafo) para reconstruirlo.
+    """
+    firma = (grafo.number_of_nodes(), grafo.number_of_edges())
+    cache = grafo.graph.get('etiquetas_hub')
+    if cache is None or cache[0] != firma:
+        cache = (firma, EtiquetasHub.construir(obtener_csr(grafo)))
+        grafo.graph['etiquetas_hub'] = cache
+    return cache[1]
+
+
+def etiquetas_hub_ruta(grafo, origen, destino):
+    """
+    Consulta punto a punto con etiquetas de hubs, incluyendo la ruta: la
+    recuperación hace una consulta de etiqueta por vecino en cada salto,
+    así que cuesta mucho más que la distancia sola (etiquetas_hub_distancia).
+    """
+    return obtener_etiquetas(grafo).ruta(obtener_csr(grafo), origen, destino)
+
+
+def etiquetas_hub_distancia(grafo, origen, destino):
+    """
+    Sólo la distancia (un merge-join de dos etiquetas), sin ruta.
+
+    Returns:
+        dict con ruta (vacía), distancia, nodos_expandidos (consultas de
+        etiqueta hechas: 1), tiempo
+    """
+    etiquetas = obtener_etiquetas(grafo)
+    start_time = time.time()
+    distancia = etiquetas.distancia(origen, destino)
+    return {
+        'ruta': [],
+        'distancia': distancia,
+        'nodos_expandidos': 1,
+        'tiempo': time.time() - start_time
+    }
@@ -0,0 +1,245 @@
+# -----------------------------------Overlay de celdas personalizable (estilo CRP)-----------------------
+import heapq
+import time
+
+import numpy as np
+
+from graph_arrays import GrafoCSR, obtener_csr
+from partitioning import particionar
+
+INF = float('inf')
+
+
+class OverlayCeldas:  # Partición + cliques de frontera que se recalculan por celda al cambiar pesos
+
+    def __init__(self, csr, celda):
+        """
+        Preprocesamiento independiente de la métrica (frontera de cada
+        celda) seguido de la personalización completa.
+
+        Args:
+            csr: GrafoCSR (se copian los pesos, el original no se modifica)
+            celda: arreglo con la celda de cada índice de nodo
+        """
+        self.csr = csr
+        self.celda = np.asarray(celda, dtype=np.int64)
+        self.num_celdas = int(self.celda.max()) + 1 if len(self.celda) else 0
+
+        self._indptr = csr.indptr.tolist()
+        self._indices = csr.indices.tolist()
+        self._pesos = csr.pesos.tolist()
+        self._celda = self.celda.tolist()
+
+        # Nodos de frontera: extremos de algún arco entre celdas distintas
+        origenes_arcos = np.repeat(np.arange(csr.num_nodos), np.diff(csr.indptr))
+        corte = self.celda[origenes_arcos] != self.celda[csr.indices]
+        frontera = np.unique(np.concatenate([origenes_arcos[corte], csr.indices[corte]]))
+
+        self.frontera_por_celda = [[] for _ in range(self.num_celdas)]
+        self.posicion_en_frontera = {}
+        for nodo in frontera.tolist():
+            c = self._celda[nodo]
+            self.posicion_en_frontera[nodo] = len(self.frontera_por_celda[c])
+            self.frontera_por_celda[c].append(nodo)
+
+        self.matrices = [None] * self.num_celdas
+        self._atajos = [None] * self.num_celdas
+        self.tiempo_particion = 0.0  # Lo completa construir_overlay
+        t0 = time.perf_counter()
+        self.personalizar()
+        self.tiempo_personalizacion = time.perf_counter() - t0
+
+    # ------------------ personalización ------------------
+
+    def _dijkstra_en_celda(self, fuente, c, destino=None):
+        """Dijkstra que sólo usa arcos internos de la celda c"""
+        dist = {fuente: 0.0}
+        pred = {}
+        cola = [(0.0, fuente)]
+        while cola:
+            d, u = heapq.heappop(cola)
+            if d > dist[u]:
+                continue
+            if u == destino:
+                break
+            for k in range(self._indptr[u], self._indptr[u + 1]):
+                v = self._indices[k]
+                if self._celda[v] != c:
+                    continue
+                nueva = d + self._pesos[k]
+                if nueva < dist.get(v, INF):
+                    dist[v] = nueva
+                    pred[v] = u
+                    heapq.heappush(cola, (nueva, v))
+        return dist, pred
+
+    def personalizar(self, celdas=None):
+        """
+        Calcula, para cada celda, la matriz de distancias internas entre sus
+        nodos de frontera (la clique del overlay). Sólo depende de los
+        pesos internos de la celda, por eso un cambio de peso sólo obliga a
+        recalcular la celda que lo contiene.
+        """
+        for c in (range(self.num_celdas) if celdas is None else celdas):
+            frontera = self.frontera_por_celda[c]
+            matriz = np.full((len(frontera), len(frontera)), INF)
+            for i, b in enumerate(frontera):
+                dist, _ = self._dijkstra_en_celda(b, c)
+                for j, b2 in enumerate(frontera):
+                    matriz[i, j] = dist.get(b2, INF)
+            self.matrices[c] = matriz
+            # Lista de (destino, peso) finitos para que la consulta no itere infinitos
+            self._atajos[c] = [
+                [(frontera[j], w) for j, w in enumerate(fila) if w < INF and j != i]
+                for i, fila in enumerate(matriz.tolist())
+            ]
+
+    def actualizar_pesos(self, cambios):
+        """
+        Cambia pesos de arcos y re-personaliza sólo las celdas afectadas.
+        Los arcos de corte se leen directamente en la consulta y no
+        requieren recalcular nada.
+
+        Args:
+            cambios: dict {(u, v): nuevo_peso} con ids originales; en grafos
+                no dirigidos se actualizan ambos sentidos
+
+        Returns:
+            dict con celdas_recalculadas y tiempo
+        """
+        t0 = time.perf_counter()
+        afectadas = set()
+        for (u, v), peso in cambios.items():
+            i, j = self.csr.indice[u], self.csr.indice[v]
+            sentidos = [(i, j)] if self.csr.dirigido else [(i, j), (j, i)]
+            for a, b in sentidos:
+                for k in range(self._indptr[a], self._indptr[a + 1]):
+                    if self._indices[k] == b:
+                        self._pesos[k] = peso
+                if self._celda[a] == self._celda[b]:
+                    afectadas.add(self._celda[a])
+
+        self.personalizar(sorted(afectadas))
+        return {'celdas_recalculadas': sorted(afectadas), 'tiempo': time.perf_counter() - t0}
+
+    # ------------------ consulta ------------------
+
+    def buscar(self, origen, destino):
+        """
+        Dijkstra sobre el grafo de búsqueda del overlay: arcos originales en
+        las celdas de origen y destino; en el resto, sólo cliques de
+        frontera y arcos de corte.
+
+        Returns:
+            dict con ruta, distancia, nodos_expandidos, tiempo
+        """
+        start_time = time.time()
+        s, t = self.csr.indice[origen], self.csr.indice[destino]
+        celda_s, celda_t = self._celda[s], self._celda[t]
+        nodos_expandidos = 0
+
+        dist = {s: 0.0}
+        pred = {}  # nodo -> (anterior, celda del atajo o None si es arco original)
+        cola = [(0.0, s)]
+
+        while cola:
+            d, u = heapq.heappop(cola)
+            if d > dist[u]:
+                continue
+            nodos_expandidos += 1
+            if u == t:
+                break
+
+            c = self._celda[u]
+            local = c == celda_s or c == celda_t
+            if not local:
+                for v, w in self._atajos[c][self.posicion_en_frontera[u]]:
+                    if d + w < dist.get(v, INF):
+                        dist[v] = d + w
+                        pred[v] = (u, c)
+                        heapq.heappush(cola, (d + w, v))
+
+            for k in range(self._indptr[u], self._indptr[u + 1]):
+                v = self._indices[k]
+                if not local and self._celda[v] == c:
+                    continue  # Dentro de una celda intermedia se usan los atajos
+                nueva = d + self._pesos[k]
+                if nueva < dist.get(v, INF):
+                    dist[v] = nueva
+                    pred[v] = (u, None)
+                    heapq.heappush(cola, (nueva, v))
+
+        return {
+            'ruta': self._desempacar(pred, s, t) if t in dist else [],
+            'distancia': dist.get(t, INF),
+            'nodos_expandidos': nodos_expandidos,
+            'tiempo': time.time() - start_time
+        }
+
+    def _desempacar(self, pred, s, t):
+        """Reconstruye la ruta sustituyendo cada atajo por su camino interno"""
+        ruta = [t]
+        nodo = t
+        while nodo != s:
+            anterior, c = pred[nodo]
+            if c is None:
+                ruta.append(anterior)
+            else:
+                _, pred_celda = self._dijkstra_en_celda(anterior, c, nodo)
+                tramo = nodo
+                while tramo != anterior:
+                    tramo = pred_celda[tramo]
+                    ruta.append(tramo)
+            nodo = anterior
+        return self.csr.ruta_a_ids(ruta[::-1])
+
+    def memoria_bytes(self):
+        """Memoria del overlay: celdas, listas de frontera y matrices de cliques"""
+        return (self.celda.nbytes +
+                sum(m.nbytes for m in self.matrices if m is not None) +
+                8 * sum(len(f) for f in self.frontera_por_celda))
+
+    def estadisticas(self):
+        """Tamaño del overlay para reportes"""
+        tamanos = [len(f) for f in self.frontera_por_celda]
+        return {
+            'num_celdas': self.num_celdas,
+            'nodos_frontera': sum(tamanos),
+            'frontera_maxima': max(tamanos, default=0),
+            'memoria_KB': self.memoria_bytes() / 1024.0,
+            'tiempo_personalizacion': self.tiempo_personalizacion
+        }
+
+
+def construir_overlay(grafo, num_celdas=16):
+    """
+    Particiona el grafo (k-d con 'pos', BFS sin él) y construye el overlay.
+
+    Returns:
+        (overlay, tiempo_particion)
+    """
+    csr = grafo if isinstance(grafo, GrafoCSR) else obtener_csr(grafo)
+    t0 = time.perf_counter()
+    celda = particionar(csr, num_celdas)
+    tiempo_particion = time.perf_counter() - t0
+    overlay = OverlayCeldas(csr, celda)
+    overlay.tiempo_particion = tiempo_particion
+    return overlay, tiempo_particion
+
+
+def obtener_overlay(grafo, num_celdas=16):
+    """
+    Overlay cacheado en grafo.graph['overlay'], como obtener_csr. Si cambian
+    los pesos, usar overlay.actualizar_pesos o invalidar_caches(grafo).
+    """
+    firma = (grafo.number_of_nodes(), grafo.number_of_edges(), num_celdas)
+    cache = grafo.graph.get('overlay')
+    if cache is None or cache[0] != firma:
+        cache = (firma, construir_overlay(grafo, num_celdas)[0])
+        grafo.graph['overlay'] = cache
+    return cache[1]
+
+
+def overlay_ruta(grafo, origen, destino):
+    """Consulta punto a punto con el overlay (construido una vez por grafo)"""
+    return obtener_overlay(grafo).buscar(origen, destino)
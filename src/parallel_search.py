@@ -0,0 +1,318 @@
+# -----------------------------------Dijkstra bidireccional paralelo-----------------------
+import heapq
+import multiprocessing as mp
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from graph_arrays import GrafoCSR
+
+INF = float('inf')
+
+# Posiciones del arreglo de estado compartido
+MEJOR, TOPE_FORWARD, TOPE_BACKWARD, ENCUENTRO = 0, 1, 2, 3
+
+
+def gil_habilitado():
+    """True salvo en el build free-threaded (sin GIL) de CPython 3.13+"""
+    verificar = getattr(sys, '_is_gil_enabled', None)
+    return True if verificar is None else verificar()
+
+
+def _expandir_mitad(indptr, indices, pesos, fuente, dist_propia, dist_otra,
+                    pred_propia, estado, lock, lado):
+    """
+    Una mitad de la búsqueda bidireccional (lado = TOPE_FORWARD o TOPE_BACKWARD).
+
+    Publica en estado[lado] la clave mínima de su cola y se detiene cuando
+    tope_propio + tope_otro >= mejor. Como los topes sólo crecen, leer un
+    tope viejo de la otra mitad es conservador. El mejor encuentro se
+    actualiza bajo 'lock'.
+
+    Funciona igual con listas (hilos) o memoryviews de memoria compartida
+    (procesos). Devuelve el número de nodos expandidos.
+    """
+    otro = TOPE_BACKWARD if lado == TOPE_FORWARD else TOPE_FORWARD
+    nodos_expandidos = 0
+    cola = [(0.0, fuente)]
+
+    while cola:
+        d, u = heapq.heappop(cola)
+        if d > dist_propia[u]:
+            continue  # Entrada obsoleta
+
+        estado[lado] = d
+        if d + estado[otro] >= estado[MEJOR]:
+            return nodos_expandidos  # Criterio de parada bidireccional
+        nodos_expandidos += 1
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nueva_dist = d + pesos[k]
+            if nueva_dist < dist_propia[v]:
+                dist_propia[v] = nueva_dist
+                pred_propia[v] = u
+                heapq.heappush(cola, (nueva_dist, v))
+
+            # Verificar encuentro con la otra mitad
+            candidato = dist_propia[v] + dist_otra[v]
+            if candidato < estado[MEJOR]:
+                with lock:
+                    if candidato < estado[MEJOR]:
+                        estado[MEJOR] = candidato
+                        estado[ENCUENTRO] = v
+
+    estado[lado] = INF  # Cola agotada
+    return nodos_expandidos
+
+
+def _expandir_alternado(adyacencia_f, adyacencia_b, s, t, dist_f, dist_b, pred_f, pred_b, estado):
+    """
+    Referencia serial de _expandir_mitad: las dos mitades en un solo hilo,
+    un nodo por turno, con la misma regla de parada (tope_f + tope_b >=
+    mejor). Sirve para medir cuánto aporta el paralelismo por sí solo.
+    """
+    mitades = [
+        (TOPE_FORWARD, TOPE_BACKWARD, adyacencia_f, dist_f, dist_b, pred_f, [(0.0, s)]),
+        (TOPE_BACKWARD, TOPE_FORWARD, adyacencia_b, dist_b, dist_f, pred_b, [(0.0, t)]),
+    ]
+    nodos_expandidos = 0
+    turno = 0
+
+    while mitades[0][6] or mitades[1][6]:
+        lado, otro, (indptr, indices, pesos), dist_propia, dist_otra, pred_propia, cola = mitades[turno]
+        turno = 1 - turno
+        if not cola:
+            estado[lado] = INF
+            continue
+
+        d, u = heapq.heappop(cola)
+        if d > dist_propia[u]:
+            continue
+
+        estado[lado] = d
+        if d + estado[otro] >= estado[MEJOR]:
+            break
+        nodos_expandidos += 1
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nueva_dist = d + pesos[k]
+            if nueva_dist < dist_propia[v]:
+                dist_propia[v] = nueva_dist
+                pred_propia[v] = u
+                heapq.heappush(cola, (nueva_dist, v))
+
+            candidato = dist_propia[v] + dist_otra[v]
+            if candidato < estado[MEJOR]:
+                estado[MEJOR] = candidato
+                estado[ENCUENTRO] = v
+
+    return nodos_expandidos
+
+
+# ------------------ trabajadores en procesos ------------------
+
+_compartido = {}
+
+
+def _inicializar_proceso(nombres, lock):
+    """Adjunta (una vez por proceso) los segmentos de memoria compartida"""
+    _compartido['lock'] = lock
+    _compartido['segmentos'] = []
+    for clave, (nombre, formato) in nombres.items():
+        shm = shared_memory.SharedMemory(name=nombre)
+        _compartido['segmentos'].append(shm)
+        _compartido[clave] = shm.buf.cast(formato)
+
+
+def _mitad_en_proceso(fuente, lado):
+    c = _compartido
+    if lado == TOPE_FORWARD:
+        adyacencia = (c['indptr'], c['indices'], c['pesos'])
+        propia, otra, pred = c['dist_forward'], c['dist_backward'], c['pred_forward']
+    else:
+        # Arcos entrantes; en grafos no dirigidos no se comparten aparte
+        adyacencia = (c.get('indptr_inv', c['indptr']), c.get('indices_inv', c['indices']),
+                      c.get('pesos_inv', c['pesos']))
+        propia, otra, pred = c['dist_backward'], c['dist_forward'], c['pred_backward']
+    return _expandir_mitad(*adyacencia, fuente, propia, otra, pred,
+                           c['estado'], c['lock'], lado)
+
+
+class BusquedaBidireccionalParalela:  # Dijkstra bidireccional con una mitad por hilo/proceso
+
+    def __init__(self, grafo, modo='auto'):
+        """
+        Prepara el grafo (CSR) y los trabajadores una sola vez.
+
+        Args:
+            grafo: grafo de NetworkX (Graph o DiGraph) o GrafoCSR
+            modo: 'hilos', 'procesos', 'serial' o 'auto' (hilos si no hay
+                GIL, procesos con memoria compartida en otro caso). 'serial'
+                alterna las dos mitades en un hilo con la misma regla de
+                parada: es la línea base para medir el paralelismo
+        """
+        self.csr = grafo if isinstance(grafo, GrafoCSR) else GrafoCSR.desde_networkx(grafo)
+        if modo == 'auto':
+            modo = 'procesos' if gil_habilitado() else 'hilos'
+        if modo not in ('hilos', 'procesos', 'serial'):
+            raise ValueError(f"Modo desconocido: {modo}")
+        self.modo = modo
+        n = self.csr.num_nodos
+
+        if modo in ('hilos', 'serial'):
+            forward = (self.csr.indptr.tolist(), self.csr.indices.tolist(), self.csr.pesos.tolist())
+            backward = forward
+            if self.csr.dirigido:
+                backward = (self.csr.indptr_inv.tolist(), self.csr.indices_inv.tolist(),
+                            self.csr.pesos_inv.tolist())
+            self._adyacencia = {TOPE_FORWARD: forward, TOPE_BACKWARD: backward}
+            self._lock = threading.Lock()
+            self._executor = ThreadPoolExecutor(max_workers=2) if modo == 'hilos' else None
+            return
+
+        # Modo procesos: CSR, distancias, predecesores y estado en memoria compartida
+        self._segmentos = {}
+        self._vistas = {}
+        arreglos = {
+            'indptr': (self.csr.indptr, 'q'),
+            'indices': (self.csr.indices, 'q'),
+            'pesos': (self.csr.pesos, 'd'),
+            'dist_forward': (np.full(n, INF), 'd'),
+            'dist_backward': (np.full(n, INF), 'd'),
+            'pred_forward': (np.full(n, -1, dtype=np.int64), 'q'),
+            'pred_backward': (np.full(n, -1, dtype=np.int64), 'q'),
+            'estado': (np.zeros(4), 'd'),
+        }
+        if self.csr.dirigido:
+            arreglos['indptr_inv'] = (self.csr.indptr_inv, 'q')
+            arreglos['indices_inv'] = (self.csr.indices_inv, 'q')
+            arreglos['pesos_inv'] = (self.csr.pesos_inv, 'd')
+        nombres = {}
+        for clave, (arreglo, formato) in arreglos.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 8))
+            vista = np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=shm.buf)
+            vista[:] = arreglo
+            self._segmentos[clave] = shm
+            self._vistas[clave] = vista
+            nombres[clave] = (shm.name, formato)
+
+        self._lock = mp.Lock()
+        self._pool = mp.Pool(2, initializer=_inicializar_proceso,
+                             initargs=(nombres, self._lock))
+
+    def buscar(self, origen, destino):
+        """
+        Ejecuta la búsqueda entre dos ids de nodo.
+
+        Returns:
+            dict con ruta, distancia, nodos_expandidos, tiempo
+        """
+        start_time = time.time()
+        s = self.csr.indice[origen]
+        t = self.csr.indice[destino]
+        if s == t:
+            return {'ruta': [origen], 'distancia': 0, 'nodos_expandidos': 0,
+                    'tiempo': time.time() - start_time}
+
+        if self.modo in ('hilos', 'serial'):
+            mejor, encuentro, pred_f, pred_b, nodos_expandidos = self._buscar_hilos(s, t)
+        else:
+            mejor, encuentro, pred_f, pred_b, nodos_expandidos = self._buscar_procesos(s, t)
+
+        ruta = []
+        if mejor < INF:
+            primera_mitad = [encuentro]
+            while primera_mitad[-1] != s:
+                primera_mitad.append(pred_f[primera_mitad[-1]])
+            segunda_mitad = []
+            nodo = encuentro
+            while nodo != t:
+                nodo = pred_b[nodo]
+                segunda_mitad.append(nodo)
+            ruta = self.csr.ruta_a_ids(primera_mitad[::-1] + segunda_mitad)
+
+        return {
+            'ruta': ruta,
+            'distancia': mejor,
+            'nodos_expandidos': nodos_expandidos,
+            'tiempo': time.time() - start_time
+        }
+
+    def _buscar_hilos(self, s, t):
+        n = self.csr.num_nodos
+        dist_f, dist_b = [INF] * n, [INF] * n
+        pred_f, pred_b = [-1] * n, [-1] * n
+        dist_f[s], dist_b[t] = 0.0, 0.0
+        estado = [INF, 0.0, 0.0, -1]
+
+        if self._executor is None:
+            nodos_expandidos = _expandir_alternado(
+                self._adyacencia[TOPE_FORWARD], self._adyacencia[TOPE_BACKWARD], s, t,
+                dist_f, dist_b, pred_f, pred_b, estado)
+            return estado[MEJOR], int(estado[ENCUENTRO]), pred_f, pred_b, nodos_expandidos
+
+        futuro_f = self._executor.submit(
+            _expandir_mitad, *self._adyacencia[TOPE_FORWARD], s, dist_f, dist_b, pred_f,
+            estado, self._lock, TOPE_FORWARD)
+        futuro_b = self._executor.submit(
+            _expandir_mitad, *self._adyacencia[TOPE_BACKWARD], t, dist_b, dist_f, pred_b,
+            estado, self._lock, TOPE_BACKWARD)
+        nodos_expandidos = futuro_f.result() + futuro_b.result()
+
+        # Cierre exacto, como en procesos: sin GIL nada garantiza que cada
+        # hilo haya visto la última escritura de dist_* del otro
+        suma = np.add(dist_f, dist_b)
+        encuentro = int(np.argmin(suma))
+        return float(suma[encuentro]), encuentro, pred_f, pred_b, nodos_expandidos
+
+    def _buscar_procesos(self, s, t):
+        v = self._vistas
+        v['dist_forward'].fill(INF)
+        v['dist_backward'].fill(INF)
+        v['dist_forward'][s] = 0.0
+        v['dist_backward'][t] = 0.0
+        v['estado'][:] = (INF, 0.0, 0.0, -1)
+
+        futuro_f = self._pool.apply_async(_mitad_en_proceso, (s, TOPE_FORWARD))
+        futuro_b = self._pool.apply_async(_mitad_en_proceso, (t, TOPE_BACKWARD))
+        nodos_expandidos = futuro_f.get() + futuro_b.get()
+
+        # Cierre exacto: el mejor encuentro es el mínimo de dist_f + dist_b
+        suma = v['dist_forward'] + v['dist_backward']
+        encuentro = int(np.argmin(suma))
+        return float(suma[encuentro]), encuentro, v['pred_forward'], v['pred_backward'], nodos_expandidos
+
+    def cerrar(self):
+        """Libera los hilos o procesos y la memoria compartida"""
+        if self.modo in ('hilos', 'serial'):
+            if self._executor is not None:
+                self._executor.shutdown()
+            return
+        self._pool.close()
+        self._pool.join()
+        self._vistas.clear()
+        for shm in self._segmentos.values():
+            shm.close()
+            shm.unlink()
+        self._segmentos.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def dijkstra_bidireccional_paralelo(grafo, origen, destino, modo='auto'):
+    """
+    Atajo para una sola consulta. Para muchas consultas conviene crear
+    BusquedaBidireccionalParalela una vez y llamar a buscar().
+    """
+    with BusquedaBidireccionalParalela(grafo, modo) as busqueda:
+        return busqueda.buscar(origen, destino)
@@ -0,0 +1,94 @@
+# -----------------------------------Particionamiento del grafo-----------------------
+from collections import deque
+
+import numpy as np
+
+
+def particion_kd(pos, num_celdas):
+    """
+    Bisección k-d recursiva sobre las coordenadas de los nodos.
+
+    Cada paso corta por la mediana del eje con mayor extensión, repartiendo
+    los nodos en proporción al número de celdas de cada lado.
+
+    Returns:
+        arreglo con la celda (0..num_celdas-1) de cada índice de nodo
+    """
+    pos = np.asarray(pos, dtype=np.float64)
+    celda = np.zeros(len(pos), dtype=np.int64)
+
+    def dividir(indices, k, primera_celda):
+        if k == 1 or len(indices) <= 1:
+            celda[indices] = primera_celda
+            return
+        extension = pos[indices].max(axis=0) - pos[indices].min(axis=0)
+        eje = int(np.argmax(extension))
+        orden = indices[np.argsort(pos[indices, eje], kind='stable')]
+        k_izq = k // 2
+        corte = len(orden) * k_izq // k
+        dividir(orden[:corte], k_izq, primera_celda)
+        dividir(orden[corte:], k - k_izq, primera_celda + k_izq)
+
+    dividir(np.arange(len(pos)), num_celdas, 0)
+    return celda
+
+
+def _orden_bfs(csr, indices, en_subconjunto):
+    """Orden BFS de 'indices' (restringido al subconjunto) desde un nodo pseudo-periférico"""
+    def bfs(inicio):
+        visitado = {inicio}
+        orden = [inicio]
+        cola = deque([inicio])
+        while cola:
+            u = cola.popleft()
+            for v in csr.indices[csr.indptr[u]:csr.indptr[u + 1]].tolist():
+                if en_subconjunto[v] and v not in visitado:
+                    visitado.add(v)
+                    orden.append(v)
+                    cola.append(v)
+        return orden, visitado
+
+    # El último nodo de un primer BFS está lejos de todos: buen punto de partida
+    orden, _ = bfs(int(indices[0]))
+    orden, visitado = bfs(orden[-1])
+
+    # Componentes no alcanzadas se agregan al final
+    resto = [int(i) for i in indices if int(i) not in visitado]
+    return np.array(orden + resto, dtype=np.int64)
+
+
+def particion_bfs(csr, num_celdas):
+    """
+    Bisección recursiva por crecimiento BFS, para grafos sin coordenadas.
+
+    Cada mitad es un prefijo del orden BFS desde un nodo pseudo-periférico,
+    así que las celdas quedan compactas en el grafo y con pocos arcos de corte.
+
+    Returns:
+        arreglo con la celda de cada índice de nodo
+    """
+    celda = np.zeros(csr.num_nodos, dtype=np.int64)
+    en_subconjunto = np.zeros(csr.num_nodos, dtype=bool)
+
+    def dividir(indices, k, primera_celda):
+        if k == 1 or len(indices) <= 1:
+            celda[indices] = primera_celda
+            return
+        en_subconjunto[indices] = True
+        orden = _orden_bfs(csr, indices, en_subconjunto)
+        en_subconjunto[indices] = False
+
+        k_izq = k // 2
+        corte = len(orden) * k_izq // k
+        dividir(orden[:corte], k_izq, primera_celda)
+        dividir(orden[corte:], k - k_izq, primera_celda + k_izq)
+
+    dividir(np.arange(csr.num_nodos), num_celdas, 0)
+    return celda
+
+
+def particionar(csr, num_celdas):
+    """Usa la bisección k-d si hay coordenadas y la BFS en otro caso"""
+    if csr.pos is not None:
+        return particion_kd(csr.pos, num_celdas)
+    return particion_bfs(csr, num_celdas)
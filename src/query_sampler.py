@@ -0,0 +1,177 @@
+# -----------------------------------Muestreo de consultas-----------------------
+import math
+import random
+
+import networkx as nx
+import numpy as np
+
+from graph_creator import validar_grafo_vectorizado
+
+ESTRATOS = ('corta', 'media', 'larga')
+
+
+class MuestreadorConsultas:  # Genera pares (origen, destino) conscientes de la conectividad
+
+    def __init__(self, grafo, semilla=42, componentes=None):
+        """
+        Precalcula las componentes conexas una sola vez. En un DiGraph son
+        componentes débiles, así que los destinos se filtran además por
+        alcanzabilidad hacia adelante desde cada origen (ver _alcanzables).
+
+        Args:
+            grafo: grafo de NetworkX
+            semilla: semilla del generador aleatorio
+            componentes: reporte["componentes"] de validar_grafo_vectorizado,
+                si ya se calculó
+        """
+        if componentes is None:
+            componentes = validar_grafo_vectorizado(
+                grafo, verbose=False)['componentes']
+
+        self.grafo = grafo
+        self.dirigido = grafo.is_directed()
+        self.componentes = componentes
+        self.rng = random.Random(semilla)
+
+        # Agrupar los nodos por componente (el índice sigue a grafo.nodes())
+        nodos = np.empty(len(componentes['indice_nodo']), dtype=object)
+        for nodo, i in componentes['indice_nodo'].items():
+            nodos[i] = nodo
+        orden = np.argsort(componentes['componente_de'], kind='stable')
+        cortes = np.cumsum(componentes['tamanos'])[:-1]
+        self.grupos = [list(g) for g in np.split(nodos[orden], cortes)]
+
+        # Solo sirven como origen los nodos con al menos otro nodo alcanzable
+        # (en un DiGraph, los que tienen algún arco saliente)
+        self.nodos_por_componente = [g for g in self.grupos if len(g) >= 2]
+        self.origenes_validos = [
+            nodo for grupo in self.nodos_por_componente for nodo in grupo
+            if not self.dirigido or any(v != nodo for v in grafo.successors(nodo))]
+        if not self.origenes_validos:
+            raise ValueError("El grafo no tiene ningún par de nodos conectados")
+
+    def _componente_de(self, nodo):
+        """Lista de nodos de la componente que contiene a 'nodo'"""
+        indice = self.componentes['indice_nodo'][nodo]
+        return self.grupos[self.componentes['componente_de'][indice]]
+
+    def _alcanzables(self, origen):
+        """
+        Nodos distintos de 'origen' a los que existe ruta desde él, en el
+        orden de su componente. En grafos no dirigidos es la componente
+        completa; en un DiGraph se filtra con una búsqueda hacia adelante.
+        """
+        grupo = self._componente_de(origen)
+        if not self.dirigido:
+            return [n for n in grupo if n != origen]
+        descendientes = nx.descendants(self.grafo, origen)
+        return [n for n in grupo if n in descendientes]
+
+    # ------------------ misma componente ------------------
+
+    def muestrear_misma_componente(self, num_consultas):
+        """
+        Pares (origen, destino) distintos dentro de la misma componente (en
+        un DiGraph, con destino alcanzable desde el origen).
+
+        Returns:
+            lista de tuplas (origen, destino, estrato) con estrato None
+        """
+        consultas = []
+        for _ in range(num_consultas):
+            origen = self.rng.choice(self.origenes_validos)
+            if self.dirigido:
+                destino = self.rng.choice(self._alcanzables(origen))
+            else:
+                grupo = self._componente_de(origen)
+                destino = origen
+                while destino == origen:
+                    destino = self.rng.choice(grupo)
+            consultas.append((origen, destino, None))
+        return consultas
+
+    # ------------------ estratificado por distancia ------------------
+
+    def _metrica_desde(self, origen, grupo, metrica):
+        """Distancia euclidiana o en saltos desde origen a cada nodo del grupo"""
+        if metrica == 'euclidiana':
+            posiciones = nx.get_node_attributes(self.grafo, 'pos')
+            if origen not in posiciones:
+                raise ValueError("La métrica euclidiana requiere el atributo 'pos'")
+            pos = np.array([posiciones[nodo] for nodo in grupo], dtype=float)
+            return np.hypot(pos[:, 0] - posiciones[origen][0],
+                            pos[:, 1] - posiciones[origen][1])
+        elif metrica == 'saltos':
+            saltos = nx.single_source_shortest_path_length(self.grafo, origen)
+            return np.array([saltos[nodo] for nodo in grupo], dtype=float)
+        else:
+            raise ValueError(f"Métrica desconocida: {metrica}")
+
+    def muestrear_estratificado(self, num_consultas, metrica='euclidiana'):
+        """
+        Consultas cortas, medias y largas en la misma proporción.
+
+        Para cada origen se ordenan los nodos alcanzables de su componente
+        por la métrica ('euclidiana' o 'saltos') y se toma un destino de
+        cada tercil. Los orígenes que alcanzan menos de 3 nodos se descartan.
+
+        Returns:
+            lista de tuplas (origen, destino, estrato)
+        """
+        candidatos = [n for n in self.origenes_validos if len(self._componente_de(n)) >= 4]
+
+        consultas = []
+        while len(consultas) < num_consultas:
+            if not candidatos:
+                raise ValueError("Ninguna componente es suficientemente grande para estratificar")
+            origen = self.rng.choice(candidatos)
+            grupo = self._alcanzables(origen)
+            if len(grupo) < 3:
+                candidatos.remove(origen)
+                continue
+            valores = self._metrica_desde(origen, grupo, metrica)
+            ordenados = [grupo[i] for i in np.argsort(valores, kind='stable')]
+
+            tercil = len(ordenados) / 3
+            for k, estrato in enumerate(ESTRATOS):
+                inicio = int(round(k * tercil))
+                fin = max(inicio + 1, int(round((k + 1) * tercil)))
+                destino = self.rng.choice(ordenados[inicio:fin])
+                consultas.append((origen, destino, estrato))
+
+        return consultas[:num_consultas]
+
+    # ------------------ por rango de Dijkstra ------------------
+
+    def muestrear_por_rango_dijkstra(self, num_consultas):
+        """
+        Consultas por rango de Dijkstra: para cada origen, el destino de
+        rango r es el nodo asentado en la posición 2^r de la búsqueda. Se
+        saltan los orígenes que no alcanzan ningún otro nodo.
+
+        Returns:
+            lista de tuplas (origen, destino, rango)
+        """
+        consultas = []
+        while len(consultas) < num_consultas:
+            origen = self.rng.choice(self.origenes_validos)
+            distancias = nx.single_source_dijkstra_path_length(self.grafo, origen)
+            asentados = sorted(distancias, key=distancias.get)
+            if len(asentados) < 2:
+                continue
+
+            for rango in range(int(math.log2(len(asentados) - 1)) + 1):
+                consultas.append((origen, asentados[2 ** rango], rango))
+
+        return consultas[:num_consultas]
+
+    def muestrear(self, num_consultas, estrategia='misma_componente', metrica='euclidiana'):
+        """Punto de entrada común para las estrategias de muestreo"""
+        if estrategia == 'misma_componente':
+            return self.muestrear_misma_componente(num_consultas)
+        elif estrategia == 'estratificado':
+            return self.muestrear_estratificado(num_consultas, metrica)
+        elif estrategia == 'rango_dijkstra':
+            return self.muestrear_por_rango_dijkstra(num_consultas)
+        else:
+            raise ValueError(f"Estrategia de muestreo desconocida: {estrategia}")
@@ -0,0 +1,157 @@
+# -----------------------------------Reordenamiento de nodos para localidad de caché-----------------------
+from collections import deque
+
+import numpy as np
+
+from graph_arrays import GrafoCSR, construir_csr
+
+
+def orden_hilbert(pos, bits=16):
+    """
+    Orden de los nodos a lo largo de una curva de Hilbert sobre 'pos':
+    nodos cercanos en el plano quedan cercanos en memoria.
+
+    Returns:
+        permutación: el nuevo índice i corresponde al índice viejo perm[i]
+    """
+    pos = np.asarray(pos, dtype=np.float64)
+    lado = (1 << bits) - 1
+    minimo = pos.min(axis=0)
+    extension = np.maximum(pos.max(axis=0) - minimo, 1e-12)
+    x, y = ((pos - minimo) / extension * lado).astype(np.int64).T
+
+    # Conversión (x, y) → distancia sobre la curva, vectorizada por bits
+    d = np.zeros(len(pos), dtype=np.int64)
+    s = 1 << (bits - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotar el cuadrante
+        rotar = ~ry
+        voltear = rotar & rx
+        x = np.where(voltear, lado - x, x)
+        y = np.where(voltear, lado - y, y)
+        x, y = np.where(rotar, y, x), np.where(rotar, x, y)
+        s >>= 1
+
+    return np.argsort(d, kind='stable')
+
+
+def orden_cuthill_mckee(csr):
+    """
+    Orden Cuthill–McKee inverso (RCM) para grafos sin coordenadas: BFS
+    desde un nodo pseudo-periférico visitando vecinos por grado creciente,
+    invertido al final. Reduce el ancho de banda de la matriz de adyacencia.
+    En grafos dirigidos el BFS usa la adyacencia simetrizada (arcos
+    salientes y entrantes), así cada componente débil queda completa.
+
+    Returns:
+        permutación: el nuevo índice i corresponde al índice viejo perm[i]
+    """
+    n = csr.num_nodos
+    grados = np.diff(csr.indptr)
+    if csr.dirigido:
+        grados = grados + np.diff(csr.indptr_inv)
+
+    def vecinos_de(u):
+        vecinos = csr.indices[csr.indptr[u]:csr.indptr[u + 1]]
+        if csr.dirigido:
+            vecinos = np.unique(np.concatenate(
+                [vecinos, csr.indices_inv[csr.indptr_inv[u]:csr.indptr_inv[u + 1]]]))
+        return vecinos
+
+    visitado = np.zeros(n, dtype=bool)
+    orden = []
+
+    def bfs(inicio, marcar):
+        vistos = {inicio}
+        recorrido = [inicio]
+        cola = deque([inicio])
+        while cola:
+            u = cola.popleft()
+            vecinos = vecinos_de(u)
+            for v in vecinos[np.argsort(grados[vecinos], kind='stable')].tolist():
+                if v not in vistos and not visitado[v]:
+                    vistos.add(v)
+                    recorrido.append(v)
+                    cola.append(v)
+        if marcar:
+            visitado[recorrido] = True
+        return recorrido
+
+    # Cada componente desde su nodo de menor grado, llevado a la periferia
+    for inicio in np.argsort(grados, kind='stable').tolist():
+        if visitado[inicio]:
+            continue
+        periferico = bfs(inicio, marcar=False)[-1]
+        orden.extend(bfs(periferico, marcar=True))
+
+    assert len(orden) == n, "El orden RCM no cubre todos los nodos"
+    return np.array(orden[::-1], dtype=np.int64)
+
+
+class GrafoReordenado(GrafoCSR):  # GrafoCSR permutado que recuerda el índice original de cada nodo
+
+    def __init__(self, csr, permutacion):
+        """
+        Args:
+            csr: GrafoCSR original
+            permutacion: nuevo índice i ← índice viejo permutacion[i]
+        """
+        n = csr.num_nodos
+        self.viejo_de_nuevo = np.asarray(permutacion, dtype=np.int64)
+        self.nuevo_de_viejo = np.empty(n, dtype=np.int64)
+        self.nuevo_de_viejo[self.viejo_de_nuevo] = np.arange(n)
+
+        adelante = self._permutar_adyacencia(csr.indptr, csr.indices, csr.pesos)
+        inversa = None
+        if csr.dirigido:
+            inversa = self._permutar_adyacencia(csr.indptr_inv, csr.indices_inv, csr.pesos_inv)
+
+        # Los ids originales viajan con cada nodo: ruta_a_ids sigue
+        # devolviendo los ids de siempre
+        super().__init__([csr.nodos[i] for i in self.viejo_de_nuevo.tolist()],
+                         *adelante,
+                         pos=None if csr.pos is None else csr.pos[self.viejo_de_nuevo],
+                         inversa=inversa)
+
+    def _permutar_adyacencia(self, indptr, indices, pesos):
+        n = len(indptr) - 1
+        origenes = self.nuevo_de_viejo[np.repeat(np.arange(n), np.diff(indptr))]
+        destinos = self.nuevo_de_viejo[indices]
+        # Vecinos ordenados por índice dentro de cada fila: accesos crecientes
+        orden = np.lexsort((destinos, origenes))
+        return construir_csr(n, origenes[orden], destinos[orden], pesos[orden])
+
+    def indices_originales(self, indices_nuevos):
+        """Traduce índices del grafo reordenado a índices del CSR original"""
+        return self.viejo_de_nuevo[indices_nuevos]
+
+    def indices_nuevos(self, indices_originales):
+        """Traduce índices del CSR original a índices del grafo reordenado"""
+        return self.nuevo_de_viejo[indices_originales]
+
+
+def reordenar_grafo(csr, metodo='auto'):
+    """
+    Reordena los nodos para mejorar la localidad de caché.
+
+    Args:
+        metodo: 'hilbert' (requiere pos), 'rcm', o 'auto' (hilbert si hay
+            coordenadas, rcm si no)
+
+    Returns:
+        GrafoReordenado
+    """
+    if metodo == 'auto':
+        metodo = 'hilbert' if csr.pos is not None else 'rcm'
+    if metodo == 'hilbert':
+        if csr.pos is None:
+            raise ValueError("El orden de Hilbert requiere coordenadas 'pos'")
+        permutacion = orden_hilbert(csr.pos)
+    elif metodo == 'rcm':
+        permutacion = orden_cuthill_mckee(csr)
+    else:
+        raise ValueError(f"Método de reordenamiento desconocido: {metodo}")
+    return GrafoReordenado(csr, permutacion)
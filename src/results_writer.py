@@ -0,0 +1,164 @@
+# -----------------------------------Escritura de resultados por lotes-----------------------
+import glob
+import math
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (habilita Parquet/Feather en pandas)
+    HAY_PYARROW = True
+except ImportError:
+    HAY_PYARROW = False
+
+EXTENSIONES = {'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv'}
+
+
+def _formato_efectivo(formato):
+    if formato == 'auto':
+        return 'parquet' if HAY_PYARROW else 'csv'
+    if formato in ('parquet', 'feather') and not HAY_PYARROW:
+        raise ImportError(f"El formato '{formato}' requiere pyarrow")
+    if formato not in EXTENSIONES:
+        raise ValueError(f"Formato desconocido: {formato}")
+    return formato
+
+
+def _partes(directorio):
+    """Archivos de lotes ya escritos en el directorio, en orden"""
+    archivos = []
+    for extension in EXTENSIONES.values():
+        archivos.extend(glob.glob(os.path.join(directorio, f"parte_*{extension}")))
+    return sorted(archivos)
+
+
+def _leer_parte(archivo, columnas=None):
+    if archivo.endswith('.parquet'):
+        return pd.read_parquet(archivo, columns=columnas)
+    if archivo.endswith('.feather'):
+        return pd.read_feather(archivo, columns=columnas)
+    return pd.read_csv(archivo, usecols=columnas)
+
+
+def leer_resultados(directorio, columnas=None):
+    """Itera los lotes guardados como DataFrames, sin cargarlos todos a la vez"""
+    for archivo in _partes(directorio):
+        yield _leer_parte(archivo, columnas)
+
+
+class EscritorResultados:  # Guarda registros en lotes columnar y permite reanudar corridas
+
+    def __init__(self, directorio, tamano_lote=1000, formato='auto'):
+        """
+        Args:
+            directorio: carpeta donde se escriben los lotes parte_XXXXX.*
+            tamano_lote: registros por archivo
+            formato: 'parquet', 'feather', 'csv' o 'auto' (Parquet si hay
+                pyarrow, CSV en otro caso)
+        """
+        self.directorio = directorio
+        self.tamano_lote = tamano_lote
+        self.formato = _formato_efectivo(formato)
+        self.pendientes = []
+        os.makedirs(directorio, exist_ok=True)
+
+        # Checkpoint: (caso_id, algoritmo) -> distancia de lo ya guardado
+        self.completados = {}
+        partes = _partes(directorio)
+        for df in leer_resultados(directorio, ['caso_id', 'algoritmo', 'distancia']):
+            self.completados.update(zip(zip(df['caso_id'].tolist(), df['algoritmo'].tolist()),
+                                        df['distancia'].tolist()))
+        self.siguiente_parte = len(partes)
+
+    def ya_hecho(self, caso_id, algoritmo):
+        return (caso_id, algoritmo) in self.completados
+
+    def distancia_guardada(self, caso_id, algoritmo):
+        """Distancia registrada para el par, o None si aún no se ejecutó"""
+        return self.completados.get((caso_id, algoritmo))
+
+    def agregar(self, registro):
+        """Encola un registro; al llenarse el lote se escribe a disco"""
+        self.pendientes.append(registro)
+        self.completados[(registro['caso_id'], registro['algoritmo'])] = registro['distancia']
+        if len(self.pendientes) >= self.tamano_lote:
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe el lote pendiente de forma atómica (archivo temporal + rename)"""
+        if not self.pendientes:
+            return
+        df = pd.DataFrame(self.pendientes)
+        nombre = os.path.join(self.directorio,
+                              f"parte_{self.siguiente_parte:05d}{EXTENSIONES[self.formato]}")
+        temporal = nombre + ".tmp"
+
+        if self.formato == 'parquet':
+            df.to_parquet(temporal, index=False)
+        elif self.formato == 'feather':
+            df.to_feather(temporal)
+        else:
+            df.to_csv(temporal, index=False)
+        os.replace(temporal, nombre)
+
+        self.siguiente_parte += 1
+        self.pendientes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # También se guarda lo pendiente si hubo una excepción: es el checkpoint
+        self.vaciar()
+
+
+def calcular_estadisticas_por_lotes(directorio, por_estrato=False):
+    """
+    Mismas columnas que calcular_estadisticas, pero leyendo lote por lote:
+    por grupo se acumulan conteo, media y M2 del tiempo (fórmula de Chan
+    para combinar varianzas) y sumas de expansiones y memoria.
+    """
+    grupos = ["algoritmo", "estrato"] if por_estrato else ["algoritmo"]
+    columnas = grupos + ["tiempo_medido_experimento", "nodos_expandidos", "memoria_peak_KB"]
+    acumulado = {}
+
+    for df in leer_resultados(directorio, columnas):
+        parcial = df.groupby(grupos, dropna=False).agg(
+            n=("tiempo_medido_experimento", "size"),
+            media=("tiempo_medido_experimento", "mean"),
+            var=("tiempo_medido_experimento", "var"),
+            expansiones=("nodos_expandidos", "sum"),
+            memoria=("memoria_peak_KB", "sum"),
+        )
+        for clave, fila in parcial.iterrows():
+            # Estrato vacío: NaN distintos no son iguales entre lotes, se usa None
+            if isinstance(clave, tuple):
+                clave = tuple(None if isinstance(c, float) and math.isnan(c) else c for c in clave)
+            m2 = 0.0 if fila["n"] < 2 else fila["var"] * (fila["n"] - 1)
+            if clave not in acumulado:
+                acumulado[clave] = [fila["n"], fila["media"], m2, fila["expansiones"], fila["memoria"]]
+                continue
+            n_a, media_a, m2_a, exp_a, mem_a = acumulado[clave]
+            n = n_a + fila["n"]
+            delta = fila["media"] - media_a
+            acumulado[clave] = [
+                n,
+                media_a + delta * fila["n"] / n,
+                m2_a + m2 + delta ** 2 * n_a * fila["n"] / n,
+                exp_a + fila["expansiones"],
+                mem_a + fila["memoria"],
+            ]
+
+    registros = []
+    for clave, (n, media, m2, expansiones, memoria) in sorted(acumulado.items(), key=lambda x: str(x[0])):
+        clave = clave if isinstance(clave, tuple) else (clave,)
+        registro = dict(zip(grupos, clave))
+        registro.update({
+            "tiempo_promedio": media,
+            "tiempo_std": math.sqrt(m2 / (n - 1)) if n > 1 else float("nan"),
+            "expansiones_promedio": expansiones / n,
+            "memoria_promedio_KB": memoria / n,
+        })
+        registros.append(registro)
+
+    return pd.DataFrame(registros)
@@ -0,0 +1,172 @@
+# -----------------------------------Índice espacial de nodos (rejilla uniforme)-----------------------
+import math
+
+import numpy as np
+
+
+class IndiceEspacial:  # Rejilla uniforme sobre 'pos': nodo más cercano, lotes y búsqueda por radio
+
+    def __init__(self, nodos, pos, nodos_por_celda=2):
+        """
+        Reparte los nodos en celdas cuadradas de forma que haya en promedio
+        'nodos_por_celda' por celda. Los nodos quedan ordenados por celda
+        (estilo CSR): los de la celda c son orden[inicio[c]:inicio[c + 1]].
+
+        Args:
+            nodos: ids de nodo
+            pos: arreglo (n, 2) de coordenadas
+        """
+        self.nodos = list(nodos)
+        self.pos = np.asarray(pos, dtype=np.float64).reshape(-1, 2)
+        if len(self.nodos) == 0:
+            raise ValueError("No se puede indexar un grafo sin nodos")
+
+        n = len(self.nodos)
+        self.minimo = self.pos.min(axis=0)
+        extension = np.maximum(self.pos.max(axis=0) - self.minimo, 1e-12)
+        self.lado = max(math.sqrt(extension[0] * extension[1] * nodos_por_celda / n),
+                        float(extension.max()) / 4095, 1e-12)
+        self.dims = np.minimum((extension // self.lado).astype(np.int64) + 1, 4096)
+
+        celdas = self._celdas(self.pos)
+        self.orden = np.argsort(celdas, kind='stable')
+        self.inicio = np.zeros(int(self.dims.prod()) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(celdas, minlength=int(self.dims.prod())), out=self.inicio[1:])
+
+        # Copias en listas para la consulta individual (microsegundos)
+        self._x, self._y = self.pos[:, 0].tolist(), self.pos[:, 1].tolist()
+        self._orden = self.orden.tolist()
+        self._inicio = self.inicio.tolist()
+        self._x0, self._y0 = float(self.minimo[0]), float(self.minimo[1])
+        self._ancho, self._alto = int(self.dims[0]), int(self.dims[1])
+
+    def _coordenadas_celda(self, puntos):
+        """(cx, cy) de cada punto, recortadas a la rejilla"""
+        c = ((puntos - self.minimo) // self.lado).astype(np.int64)
+        return np.clip(c, 0, self.dims - 1)
+
+    def _celdas(self, puntos):
+        c = self._coordenadas_celda(puntos)
+        return c[:, 1] * self.dims[0] + c[:, 0]
+
+    # ------------------ consultas ------------------
+
+    def mas_cercano(self, x, y):
+        """
+        Id del nodo más cercano a (x, y) y su distancia. Se recorren anillos
+        de celdas alrededor del punto hasta que el siguiente anillo ya no
+        puede contener nada más cerca (está a más de (r - 1) * lado).
+        """
+        ancho, alto, lado = self._ancho, self._alto, self.lado
+        cx = min(max(int((x - self._x0) // lado), 0), ancho - 1)
+        cy = min(max(int((y - self._y0) // lado), 0), alto - 1)
+        xs, ys, orden, inicio = self._x, self._y, self._orden, self._inicio
+
+        mejor, mejor_d2 = -1, math.inf
+        r = 0
+        while True:
+            for gy in range(max(cy - r, 0), min(cy + r, alto - 1) + 1):
+                borde = gy == cy - r or gy == cy + r
+                paso = 1 if borde else 2 * r
+                for gx in range(cx - r, cx + r + 1, max(paso, 1)):
+                    if gx < 0 or gx >= ancho:
+                        continue
+                    c = gy * ancho + gx
+                    for k in range(inicio[c], inicio[c + 1]):
+                        i = orden[k]
+                        d2 = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+                        if d2 < mejor_d2:
+                            mejor, mejor_d2 = i, d2
+            cubierto = r >= max(cx, cy, ancho - 1 - cx, alto - 1 - cy)
+            if cubierto or (mejor >= 0 and mejor_d2 <= (r * lado) ** 2):
+                break
+            r += 1
+        return self.nodos[mejor], math.sqrt(mejor_d2)
+
+    def mas_cercanos(self, puntos):
+        """
+        Ajuste por lotes de un arreglo (p, 2) de coordenadas, vectorizado:
+        todos los puntos pendientes avanzan anillo por anillo a la vez.
+
+        Returns:
+            (indices, distancias): índices de nodo (posiciones en self.nodos)
+            y distancias, ambos arreglos de longitud p
+        """
+        puntos = np.asarray(puntos, dtype=np.float64).reshape(-1, 2)
+        p = len(puntos)
+        celda = self._coordenadas_celda(puntos)
+        mejor = np.full(p, -1, dtype=np.int64)
+        mejor_d2 = np.full(p, np.inf)
+        pendientes = np.arange(p)
+        r = 0
+
+        while len(pendientes):
+            c = celda[pendientes]
+            for dx in range(-r, r + 1):
+                for dy in ((-r, r) if abs(dx) != r else range(-r, r + 1)):
+                    gx, gy = c[:, 0] + dx, c[:, 1] + dy
+                    dentro = (gx >= 0) & (gx < self.dims[0]) & (gy >= 0) & (gy < self.dims[1])
+                    if not dentro.any():
+                        continue
+                    filas = pendientes[dentro]
+                    celdas = gy[dentro] * self.dims[0] + gx[dentro]
+                    # Todos los pares (punto, nodo de su celda) en arreglos planos
+                    conteos = self.inicio[celdas + 1] - self.inicio[celdas]
+                    total = int(conteos.sum())
+                    if total == 0:
+                        continue
+                    desplazamiento = np.arange(total) - np.repeat(np.cumsum(conteos) - conteos, conteos)
+                    candidatos = self.orden[np.repeat(self.inicio[celdas], conteos) + desplazamiento]
+                    de_fila = np.repeat(filas, conteos)
+                    d2 = ((self.pos[candidatos] - puntos[de_fila]) ** 2).sum(axis=1)
+
+                    np.minimum.at(mejor_d2, de_fila, d2)
+                    ganadores = d2 == mejor_d2[de_fila]
+                    mejor[de_fila[ganadores]] = candidatos[ganadores]
+
+            cubierto = r >= np.maximum.reduce([c[:, 0], c[:, 1],
+                                               self.dims[0] - 1 - c[:, 0], self.dims[1] - 1 - c[:, 1]])
+            listo = cubierto | ((mejor[pendientes] >= 0) & (mejor_d2[pendientes] <= (r * self.lado) ** 2))
+            pendientes = pendientes[~listo]
+            r += 1
+
+        return mejor, np.sqrt(mejor_d2)
+
+    def en_radio(self, x, y, radio):
+        """
+        Nodos a distancia <= radio de (x, y), ordenados por distancia.
+
+        Returns:
+            dict con nodos (ids) y distancias (arreglo NumPy)
+        """
+        esquinas = np.array([[x - radio, y - radio], [x + radio, y + radio]])
+        (x0, y0), (x1, y1) = self._coordenadas_celda(esquinas)
+        filas = [self.orden[self.inicio[gy * self.dims[0] + x0]:self.inicio[gy * self.dims[0] + x1 + 1]]
+                 for gy in range(y0, y1 + 1)]
+        candidatos = np.concatenate(filas)
+        distancias = np.hypot(self.pos[candidatos, 0] - x, self.pos[candidatos, 1] - y)
+        dentro = distancias <= radio
+        candidatos, distancias = candidatos[dentro], distancias[dentro]
+        orden = np.argsort(distancias, kind='stable')
+        return {
+            'nodos': [self.nodos[i] for i in candidatos[orden].tolist()],
+            'distancias': distancias[orden]
+        }
+
+
+def obtener_indice_espacial(grafo):
+    """
+    Índice construido una vez por grafo y cacheado en
+    grafo.graph['indice_espacial'], como obtener_csr. Si se mueven nodos,
+    llamar a invalidar_caches(grafo).
+    """
+    firma = (grafo.number_of_nodes(), grafo.number_of_edges())
+    cache = grafo.graph.get('indice_espacial')
+    if cache is None or cache[0] != firma:
+        nodos = list(grafo.nodes())
+        if not all('pos' in grafo.nodes[n] for n in nodos):
+            raise ValueError("El índice espacial requiere el atributo 'pos' en todos los nodos")
+        pos = np.array([grafo.nodes[n]['pos'] for n in nodos], dtype=np.float64)
+        cache = (firma, IndiceEspacial(nodos, pos))
+        grafo.graph['indice_espacial'] = cache
+    return cache[1]
@@ -0,0 +1,396 @@
+# -----------------------------------Almacenamiento por teselas fuera de memoria-----------------------
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from partitioning import particionar
+
+
+def _nombre_tesela(directorio, tesela):
+    return os.path.join(directorio, f"tesela_{tesela:05d}.npz")
+
+
+def escribir_teselas(csr, directorio, num_teselas=16):
+    """
+    Divide el grafo en teselas espaciales (k-d sobre 'pos', BFS sin él) y
+    escribe cada una en su propio archivo: el fragmento CSR de sus nodos
+    (destinos en índices globales), la tabla de nodos de frontera y las
+    teselas vecinas. El índice global (tesela y posición local de cada
+    nodo, ids y su orden para búsqueda binaria, coordenadas) va en
+    archivos .npy que se abren con mmap.
+
+    Args:
+        csr: GrafoCSR
+        directorio: carpeta de salida
+        num_teselas: número de teselas
+
+    Returns:
+        dict con num_teselas y bytes_totales de las teselas
+    """
+    os.makedirs(directorio, exist_ok=True)
+    n = csr.num_nodos
+    tesela_de = particionar(csr, num_teselas)
+    num_teselas = int(tesela_de.max()) + 1 if n else 0
+
+    local_de = np.empty(n, dtype=np.int64)
+    origenes_arcos = np.repeat(np.arange(n), np.diff(csr.indptr))
+    bytes_totales = 0
+
+    for tesela in range(num_teselas):
+        nodos = np.flatnonzero(tesela_de == tesela)
+        local_de[nodos] = np.arange(len(nodos))
+        arreglos = {'nodos': nodos}
+
+        adyacencias = [('', csr.indptr, csr.indices, csr.pesos)]
+        if csr.dirigido:
+            adyacencias.append(('_inv', csr.indptr_inv, csr.indices_inv, csr.pesos_inv))
+        for sufijo, indptr, indices, pesos in adyacencias:
+            grados = indptr[nodos + 1] - indptr[nodos]
+            tramos = [np.arange(indptr[i], indptr[i + 1]) for i in nodos.tolist()]
+            arcos = np.concatenate(tramos) if tramos else np.array([], dtype=np.int64)
+            indptr_local = np.zeros(len(nodos) + 1, dtype=np.int64)
+            np.cumsum(grados, out=indptr_local[1:])
+            arreglos[f'indptr{sufijo}'] = indptr_local
+            arreglos[f'indices{sufijo}'] = indices[arcos]
+            arreglos[f'pesos{sufijo}'] = pesos[arcos]
+
+        # Frontera: nodos de la tesela con algún arco hacia otra tesela
+        salientes = tesela_de[origenes_arcos] == tesela
+        corte = salientes & (tesela_de[csr.indices] != tesela)
+        arreglos['frontera'] = np.unique(origenes_arcos[corte])
+        arreglos['teselas_vecinas'] = np.unique(tesela_de[csr.indices[corte]])
+
+        np.savez(_nombre_tesela(directorio, tesela), **arreglos)
+        bytes_totales += os.path.getsize(_nombre_tesela(directorio, tesela))
+
+    ids = np.asarray(csr.nodos)
+    if ids.dtype == object:
+        raise ValueError("Sólo se pueden guardar ids de nodo numéricos o de texto")
+    np.save(os.path.join(directorio, 'ids.npy'), ids)
+    np.save(os.path.join(directorio, 'orden_ids.npy'), np.argsort(ids, kind='stable'))
+    np.save(os.path.join(directorio, 'tesela_de.npy'), tesela_de)
+    np.save(os.path.join(directorio, 'local_de.npy'), local_de)
+
+    centros = None
+    if csr.pos is not None:
+        np.save(os.path.join(directorio, 'pos.npy'), csr.pos)
+        conteos = np.maximum(np.bincount(tesela_de, minlength=num_teselas), 1)
+        centros = np.stack([np.bincount(tesela_de, csr.pos[:, eje], minlength=num_teselas) / conteos
+                            for eje in range(2)], axis=1).tolist()
+
+    with open(os.path.join(directorio, 'meta.json'), 'w') as f:
+        json.dump({
+            'num_nodos': n,
+            'num_aristas': csr.num_arcos if csr.dirigido else csr.num_arcos // 2,
+            'dirigido': csr.dirigido,
+            'num_teselas': num_teselas,
+            'centros': centros,
+        }, f)
+
+    return {'num_teselas': num_teselas, 'bytes_totales': bytes_totales}
+
+
+class Tesela:  # Fragmento CSR de una tesela cargado en memoria
+
+    def __init__(self, datos):
+        self.nodos = datos['nodos']
+        self.indptr, self.indices, self.pesos = datos['indptr'], datos['indices'], datos['pesos']
+        self.dirigido = 'indptr_inv' in datos
+        if self.dirigido:
+            self.indptr_inv = datos['indptr_inv']
+            self.indices_inv = datos['indices_inv']
+            self.pesos_inv = datos['pesos_inv']
+        self.frontera = datos['frontera']
+        self.teselas_vecinas = datos['teselas_vecinas']
+        # Todo lo que la tesela ocupa en memoria: los vecinos se sirven
+        # directamente desde estos arreglos, sin cachés por nodo
+        self.memoria_bytes = sum(a.nbytes for a in datos.values())
+
+
+class GestorTeselas:  # Carga teselas bajo demanda con presupuesto LRU y precarga direccional
+
+    def __init__(self, directorio, presupuesto_bytes=64 * 1024 * 1024, precargar=True, max_precargas=2):
+        """
+        Args:
+            directorio: carpeta escrita por escribir_teselas
+            presupuesto_bytes: memoria máxima de teselas residentes; al
+                superarse se descartan las menos usadas recientemente
+            precargar: si True, al entrar a una tesela nueva se leen en
+                segundo plano las vecinas en la dirección de la búsqueda
+            max_precargas: vecinas a precargar en cada cambio de tesela
+        """
+        self.directorio = directorio
+        with open(os.path.join(directorio, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.tesela_de = np.load(os.path.join(directorio, 'tesela_de.npy'), mmap_mode='r')
+        self.local_de = np.load(os.path.join(directorio, 'local_de.npy'), mmap_mode='r')
+        self.centros = None if self.meta['centros'] is None else np.array(self.meta['centros'])
+
+        self.presupuesto_bytes = presupuesto_bytes
+        self.precargar = precargar
+        self.max_precargas = max_precargas
+        self._residentes = OrderedDict()
+        self._en_vuelo = {}
+        self._precargadas = set()  # Leídas por precarga y aún no pedidas
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1) if precargar else None
+
+        self.objetivo = None  # Tesela destino de la consulta actual (si se conoce)
+        self._anterior = None
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        self.accesos = 0
+        self.aciertos = 0
+        self.aciertos_precarga = 0
+        self.fallos = 0
+        self.bytes_leidos = 0
+        self.teselas_precargadas = 0
+
+    def _leer(self, tesela):
+        nombre = _nombre_tesela(self.directorio, tesela)
+        with np.load(nombre, allow_pickle=False) as datos:
+            cargada = Tesela({clave: datos[clave] for clave in datos.files})
+        return cargada, os.path.getsize(nombre)
+
+    def obtener(self, tesela):
+        """Devuelve la tesela, leyéndola de disco si no está residente"""
+        self.accesos += 1
+        with self._lock:
+            cargada = self._residentes.get(tesela)
+            if cargada is not None:
+                self._residentes.move_to_end(tesela)
+            futuro = self._en_vuelo.get(tesela)
+
+        if cargada is None and futuro is not None:
+            futuro.result()  # La precarga ya estaba leyendo esta tesela
+            with self._lock:
+                cargada = self._residentes.get(tesela)
+
+        if cargada is not None and tesela not in self._precargadas:
+            self.aciertos += 1
+            return cargada
+
+        if cargada is not None:
+            self._precargadas.discard(tesela)
+            self.aciertos_precarga += 1
+        else:
+            cargada, tamano = self._leer(tesela)
+            self.fallos += 1
+            self._instalar(tesela, cargada, tamano)
+
+        # La búsqueda entró a una tesela nueva: se adelantan las siguientes
+        if self.precargar:
+            self._precargar_vecinas(tesela, cargada)
+        self._anterior = tesela
+        return cargada
+
+    def _instalar(self, tesela, cargada, tamano):
+        """Agrega una tesela a las residentes y descarta las LRU que sobren"""
+        with self._lock:
+            self.bytes_leidos += tamano
+            self._residentes[tesela] = cargada
+            self._residentes.move_to_end(tesela)
+            while self.memoria_bytes() > self.presupuesto_bytes and len(self._residentes) > 1:
+                descartada, _ = self._residentes.popitem(last=False)
+                self._precargadas.discard(descartada)
+
+    def _leer_en_segundo_plano(self, tesela):
+        cargada, tamano = self._leer(tesela)
+        self._instalar(tesela, cargada, tamano)
+        with self._lock:
+            self._precargadas.add(tesela)
+            self._en_vuelo.pop(tesela, None)
+
+    def _precargar_vecinas(self, tesela, cargada):
+        """
+        Lee en segundo plano las vecinas que avanzan en la dirección de la
+        búsqueda: hacia la tesela objetivo si se conoce, o desde la última
+        tesela nueva hacia esta. Sin coordenadas se toman las primeras.
+        """
+        with self._lock:
+            candidatas = [v for v in cargada.teselas_vecinas.tolist()
+                          if v not in self._residentes and v not in self._en_vuelo]
+            # Sólo se precarga en memoria libre: expulsar teselas en uso
+            # para adelantar otras multiplica la E/S con presupuestos chicos
+            ocupada = self.memoria_bytes() + cargada.memoria_bytes * len(self._en_vuelo)
+            promedio = max(ocupada / max(len(self._residentes) + len(self._en_vuelo), 1), 1)
+            cupo = min(int((self.presupuesto_bytes - ocupada) // promedio), self.max_precargas)
+        if not candidatas or cupo <= 0:
+            return
+
+        if self.centros is not None:
+            if self.objetivo is not None and self.objetivo != tesela:
+                direccion = self.centros[self.objetivo] - self.centros[tesela]
+            elif self._anterior is not None:
+                direccion = self.centros[tesela] - self.centros[self._anterior]
+            else:
+                return
+            avances = (self.centros[candidatas] - self.centros[tesela]) @ direccion
+            candidatas = [candidatas[i] for i in np.argsort(-avances).tolist() if avances[i] > 0]
+
+        for vecina in candidatas[:cupo]:
+            with self._lock:
+                self._en_vuelo[vecina] = self._executor.submit(self._leer_en_segundo_plano, vecina)
+            self.teselas_precargadas += 1
+
+    def memoria_bytes(self):
+        return sum(t.memoria_bytes for t in self._residentes.values())
+
+    def estadisticas(self):
+        """Tasas de acierto y E/S desde el último reinicio"""
+        return {
+            'accesos_teselas': self.accesos,
+            'aciertos': self.aciertos,
+            'aciertos_precarga': self.aciertos_precarga,
+            'fallos': self.fallos,
+            'tasa_aciertos': (self.aciertos + self.aciertos_precarga) / self.accesos if self.accesos else 0.0,
+            'teselas_precargadas': self.teselas_precargadas,
+            'bytes_leidos': self.bytes_leidos,
+            'teselas_residentes': len(self._residentes),
+            'memoria_residente_bytes': self.memoria_bytes()
+        }
+
+    def cerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+class _VistaNodos:  # Imita grafo.nodes de NetworkX: iterable, 'in' y grafo.nodes[u]['pos']
+
+    def __init__(self, grafo):
+        self._grafo = grafo
+
+    def __call__(self):
+        return iter(self)
+
+    def __iter__(self):
+        # Por bloques, para no pasar todos los ids del mmap a una lista
+        ids = self._grafo.ids
+        for inicio in range(0, len(ids), 65536):
+            yield from ids[inicio:inicio + 65536].tolist()
+
+    def __len__(self):
+        return len(self._grafo.ids)
+
+    def __contains__(self, nodo):
+        return nodo in self._grafo
+
+    def __getitem__(self, nodo):
+        i = self._grafo.indice_de(nodo)
+        if self._grafo.pos is None:
+            return {}
+        return {'pos': tuple(self._grafo.pos[i].tolist())}
+
+
+class GrafoTeselado:  # Adaptador con la interfaz de NetworkX que usan PathAlgorithms
+
+    def __init__(self, directorio, presupuesto_bytes=64 * 1024 * 1024, precargar=True,
+                 adyacencias_recientes=256):
+        """
+        Sólo el índice de nodos (ids y su orden, tesela de cada nodo,
+        coordenadas) queda residente, en mmap; los ids se buscan con
+        búsqueda binaria y las aristas se leen por teselas a través de
+        GestorTeselas.
+
+        Args:
+            adyacencias_recientes: diccionarios de adyacencia que se
+                conservan (LRU) para grafo[u][v] repetidos; su memoria es
+                constante, no crece con el grafo
+        """
+        self.gestor = GestorTeselas(directorio, presupuesto_bytes, precargar)
+        self.ids = np.load(os.path.join(directorio, 'ids.npy'), mmap_mode='r')
+        self._orden_ids = np.load(os.path.join(directorio, 'orden_ids.npy'), mmap_mode='r')
+        self._recientes = OrderedDict()
+        self._max_recientes = max(adyacencias_recientes, 1)
+        ruta_pos = os.path.join(directorio, 'pos.npy')
+        self.pos = np.load(ruta_pos, mmap_mode='r') if os.path.exists(ruta_pos) else None
+        self.nodes = _VistaNodos(self)
+        self.graph = {}
+
+    def indice_de(self, nodo):
+        """Índice global de un id de nodo (búsqueda binaria sobre ids.npy)"""
+        try:
+            p = int(np.searchsorted(self.ids, nodo, sorter=self._orden_ids))
+        except TypeError:
+            raise KeyError(nodo) from None  # Id de otro tipo que los guardados
+        if p == len(self.ids) or self.ids[self._orden_ids[p]] != nodo:
+            raise KeyError(nodo)
+        return int(self._orden_ids[p])
+
+    def _tesela_y_local(self, nodo):
+        i = self.indice_de(nodo)
+        return self.gestor.obtener(int(self.gestor.tesela_de[i])), int(self.gestor.local_de[i])
+
+    def __getitem__(self, nodo):
+        """Adyacencia {vecino: {'weight': w}} como grafo[u] en NetworkX"""
+        adyacencia = self._recientes.get(nodo)
+        if adyacencia is not None:
+            self._recientes.move_to_end(nodo)
+            return adyacencia
+        tesela, local = self._tesela_y_local(nodo)
+        inicio, fin = tesela.indptr[local], tesela.indptr[local + 1]
+        adyacencia = {v: {'weight': w} for v, w in
+                      zip(self.ids[tesela.indices[inicio:fin]].tolist(), tesela.pesos[inicio:fin].tolist())}
+        self._recientes[nodo] = adyacencia
+        if len(self._recientes) > self._max_recientes:
+            self._recientes.popitem(last=False)
+        return adyacencia
+
+    def neighbors(self, nodo):
+        return iter(self[nodo])
+
+    def predecessors(self, nodo):
+        if not self.is_directed():
+            return self.neighbors(nodo)
+        tesela, local = self._tesela_y_local(nodo)
+        inicio, fin = tesela.indptr_inv[local], tesela.indptr_inv[local + 1]
+        return iter(self.ids[tesela.indices_inv[inicio:fin]].tolist())
+
+    def is_directed(self):
+        return self.gestor.meta['dirigido']
+
+    def number_of_nodes(self):
+        return self.gestor.meta['num_nodos']
+
+    def number_of_edges(self):
+        return self.gestor.meta['num_aristas']
+
+    def __contains__(self, nodo):
+        try:
+            self.indice_de(nodo)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return len(self.ids)
+
+    def consultar(self, funcion, origen, destino, *args, **kwargs):
+        """
+        Ejecuta funcion(self, origen, destino, ...) (p. ej. un método de
+        PathAlgorithms) orientando la precarga hacia el destino, y agrega
+        al resultado las estadísticas de teselas de esa consulta.
+        """
+        self.gestor.reiniciar_estadisticas()
+        self.gestor.objetivo = int(self.gestor.tesela_de[self.indice_de(destino)])
+        try:
+            resultado = funcion(self, origen, destino, *args, **kwargs)
+        finally:
+            self.gestor.objetivo = None
+        resultado.update(self.gestor.estadisticas())
+        return resultado
+
+    def cerrar(self):
+        self.gestor.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,316 @@
+# -----------------------------------Pesos dependientes del tiempo (perfiles lineales por tramos)-----------------------
+import heapq
+import math
+import time
+from bisect import bisect_right
+
+import numpy as np
+
+from graph_arrays import GrafoCSR
+
+INF = float('inf')
+
+
+def _validar_perfiles(num_arcos, offsets, horas, valores, periodo):
+    """
+    Verifica que cada arco tenga al menos un punto, horas estrictamente
+    crecientes en [0, periodo) y la propiedad FIFO: salir más tarde nunca
+    hace llegar antes, es decir, la pendiente de cada tramo es >= -1
+    (incluido el tramo que cierra el periodo).
+    """
+    if len(offsets) != num_arcos + 1:
+        raise ValueError("Se necesita un offset por arco más uno")
+    puntos = np.diff(offsets)
+    if (puntos < 1).any():
+        raise ValueError("Cada arco necesita al menos un punto en su perfil")
+    if ((horas < 0) | (horas >= periodo)).any():
+        raise ValueError("Las horas de los perfiles deben estar en [0, periodo)")
+    if (valores < 0).any():
+        raise ValueError("Los tiempos de viaje no pueden ser negativos")
+
+    # Tramos dentro de cada arco (se descartan los que cruzan de un arco al siguiente)
+    dt = np.diff(horas)
+    dv = np.diff(valores)
+    mismo_arco = np.ones(len(dt), dtype=bool)
+    mismo_arco[offsets[1:-1] - 1] = False
+    dt, dv = dt[mismo_arco], dv[mismo_arco]
+
+    # Tramo de cierre: del último punto al primero del periodo siguiente
+    con_tramos = puntos > 1
+    primeros, ultimos = offsets[:-1][con_tramos], offsets[1:][con_tramos] - 1
+    dt_cierre = horas[primeros] + periodo - horas[ultimos]
+    dv_cierre = valores[primeros] - valores[ultimos]
+
+    if (dt <= 0).any():
+        raise ValueError("Las horas de cada perfil deben ser estrictamente crecientes")
+    if (dv < -dt - 1e-9).any() or (dv_cierre < -dt_cierre - 1e-9).any():
+        raise ValueError("Perfil no FIFO: algún tramo baja más rápido que el paso del tiempo")
+
+
+class GrafoTemporal(GrafoCSR):  # GrafoCSR cuyos arcos tienen un perfil periódico de tiempo de viaje
+
+    def __init__(self, csr, offsets, horas, valores, periodo=1440.0):
+        """
+        Los perfiles viven en tres arreglos planos, alineados con los arcos
+        del CSR: los puntos (hora, tiempo de viaje) del arco k son
+        horas[offsets[k]:offsets[k + 1]] y valores[...] (el mismo rango).
+        Entre puntos se interpola linealmente y el perfil se repite cada
+        'periodo'. Un arco de un solo punto tiene tiempo constante.
+
+        Args:
+            csr: GrafoCSR con la topología (sus pesos quedan como pesos estáticos)
+            offsets: arreglo de num_arcos + 1 posiciones
+            horas, valores: puntos de quiebre de todos los arcos, concatenados
+            periodo: longitud del ciclo (por defecto un día en minutos)
+        """
+        inversa = None
+        if csr.dirigido:
+            inversa = (csr.indptr_inv, csr.indices_inv, csr.pesos_inv)
+        super().__init__(csr.nodos, csr.indptr, csr.indices, csr.pesos, csr.pos, inversa)
+
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.horas = np.asarray(horas, dtype=np.float64)
+        self.valores = np.asarray(valores, dtype=np.float64)
+        self.periodo = float(periodo)
+        _validar_perfiles(self.num_arcos, self.offsets, self.horas, self.valores, self.periodo)
+
+        # Copias en listas para las búsquedas (bisect e indexado rápidos)
+        self._offsets = self.offsets.tolist()
+        self._horas = self.horas.tolist()
+        self._valores = self.valores.tolist()
+        self._indptr = self.indptr.tolist()
+        self._indices = self.indices.tolist()
+        self._factor_cota = None  # Lo calcula astar_dependiente_tiempo la primera vez
+
+    def tiempo_viaje(self, k, hora):
+        """Tiempo de viaje del arco k saliendo a 'hora'"""
+        inicio, fin = self._offsets[k], self._offsets[k + 1]
+        if fin - inicio == 1:
+            return self._valores[inicio]
+
+        horas, valores = self._horas, self._valores
+        h = hora % self.periodo
+        j = bisect_right(horas, h, inicio, fin)
+        if j == inicio:  # Antes del primer punto: tramo de cierre del periodo anterior
+            h0, v0, h1, v1 = horas[fin - 1] - self.periodo, valores[fin - 1], horas[inicio], valores[inicio]
+        elif j == fin:  # Después del último punto: tramo de cierre hacia el siguiente periodo
+            h0, v0, h1, v1 = horas[fin - 1], valores[fin - 1], horas[inicio] + self.periodo, valores[inicio]
+        else:
+            h0, v0, h1, v1 = horas[j - 1], valores[j - 1], horas[j], valores[j]
+        return v0 + (v1 - v0) * (h - h0) / (h1 - h0)
+
+    def memoria_perfiles_bytes(self):
+        return self.offsets.nbytes + self.horas.nbytes + self.valores.nbytes
+
+    def _arreglos_guardables(self):
+        arreglos = super()._arreglos_guardables()
+        arreglos.update({
+            'perfil_offsets': self.offsets,
+            'perfil_horas': self.horas,
+            'perfil_valores': self.valores,
+            'periodo': np.array(self.periodo),
+        })
+        return arreglos
+
+    @classmethod
+    def cargar(cls, nombre_archivo):
+        """Carga un grafo guardado con guardar() (topología y perfiles en un solo .npz)"""
+        csr = GrafoCSR.cargar(nombre_archivo)
+        with np.load(nombre_archivo, allow_pickle=False) as datos:
+            return cls(csr, datos['perfil_offsets'], datos['perfil_horas'],
+                       datos['perfil_valores'], float(datos['periodo']))
+
+
+# ------------------ construcción de perfiles ------------------
+
+def perfiles_constantes(csr, periodo=1440.0):
+    """Un punto por arco con su peso estático: equivale al modo sin tiempo"""
+    offsets = np.arange(csr.num_arcos + 1, dtype=np.int64)
+    return GrafoTemporal(csr, offsets, np.zeros(csr.num_arcos), csr.pesos.copy(), periodo)
+
+
+def perfiles_hora_punta(csr, periodo=1440.0, picos=(480.0, 1080.0), ancho=120.0,
+                        factor_maximo=2.5, semilla=0):
+    """
+    Perfiles sintéticos con dos horas punta: cada arco vale su peso
+    estático fuera de los picos y sube linealmente hasta peso * factor en
+    cada pico (factor al azar entre 1 y factor_maximo por arco).
+    El factor se recorta si hiciera falta para respetar FIFO.
+    """
+    rng = np.random.default_rng(semilla)
+    m = csr.num_arcos
+    base = csr.pesos
+    # Pendiente de bajada = base * (factor - 1) / ancho, que debe ser <= 1
+    factor = 1.0 + rng.random(m) * (factor_maximo - 1.0)
+    factor = np.minimum(factor, 1.0 + ancho / np.maximum(base, 1e-12))
+
+    horas_arco = []
+    multiplicadores = []
+    for pico in picos:
+        horas_arco.extend([pico - ancho, pico, pico + ancho])
+        multiplicadores.extend([np.ones(m), factor, np.ones(m)])
+    horas_arco = np.mod(horas_arco, periodo)
+    orden = np.argsort(horas_arco, kind='stable')
+    horas_arco = horas_arco[orden]
+    multiplicadores = np.stack(multiplicadores)[orden]  # (puntos, m)
+
+    puntos = len(horas_arco)
+    offsets = np.arange(0, puntos * m + 1, puntos, dtype=np.int64)
+    horas = np.tile(horas_arco, m)
+    valores = (multiplicadores * base).T.ravel()
+    return GrafoTemporal(csr, offsets, horas, valores, periodo)
+
+
+def perfiles_desde_dataframe(csr, df, periodo=1440.0):
+    """
+    Perfiles a partir de un DataFrame con columnas nodo_origen, nodo_destino,
+    hora, tiempo_viaje (una fila por punto de quiebre).
+
+    En grafos no dirigidos el perfil de (u, v) se usa también para (v, u)
+    salvo que ese sentido tenga filas propias. Los arcos sin filas quedan
+    con su peso estático como tiempo constante.
+    """
+    columnas = ['nodo_origen', 'nodo_destino', 'hora', 'tiempo_viaje']
+    if not all(col in df.columns for col in columnas):
+        raise ValueError("El CSV debe contener las columnas: nodo_origen, nodo_destino, hora, tiempo_viaje")
+
+    arco_de = {}
+    origenes_arcos = np.repeat(np.arange(csr.num_nodos), np.diff(csr.indptr)).tolist()
+    for k, (i, j) in enumerate(zip(origenes_arcos, csr.indices.tolist())):
+        arco_de.setdefault((i, j), k)
+
+    try:
+        filas_i = [csr.indice[u] for u in df['nodo_origen'].tolist()]
+        filas_j = [csr.indice[v] for v in df['nodo_destino'].tolist()]
+    except KeyError as e:
+        raise ValueError(f"El perfil menciona un nodo que no está en el grafo: {e}") from None
+    pares = list(zip(filas_i, filas_j))
+    faltantes = [p for p in pares if p not in arco_de]
+    if faltantes:
+        raise ValueError(f"El perfil menciona {len(faltantes)} filas sin arco en el grafo")
+
+    arcos = np.array([arco_de[p] for p in pares], dtype=np.int64)
+    horas = df['hora'].to_numpy(dtype=np.float64)
+    valores = df['tiempo_viaje'].to_numpy(dtype=np.float64)
+
+    if not csr.dirigido:
+        explicitos = set(arcos.tolist())
+        inversos = np.array([arco_de[(j, i)] for i, j in pares], dtype=np.int64)
+        espejo = np.array([k not in explicitos for k in inversos.tolist()], dtype=bool)
+        arcos = np.concatenate([arcos, inversos[espejo]])
+        horas = np.concatenate([horas, horas[espejo]])
+        valores = np.concatenate([valores, valores[espejo]])
+
+    sin_perfil = np.setdiff1d(np.arange(csr.num_arcos), arcos)
+    arcos = np.concatenate([arcos, sin_perfil])
+    horas = np.concatenate([horas, np.zeros(len(sin_perfil))])
+    valores = np.concatenate([valores, csr.pesos[sin_perfil]])
+
+    orden = np.lexsort((horas, arcos))
+    offsets = np.zeros(csr.num_arcos + 1, dtype=np.int64)
+    np.cumsum(np.bincount(arcos, minlength=csr.num_arcos), out=offsets[1:])
+    return GrafoTemporal(csr, offsets, horas[orden], valores[orden], periodo)
+
+
+def cargar_perfiles_csv(csr, nombre_archivo, periodo=1440.0):
+    """Carga perfiles desde CSV (ver perfiles_desde_dataframe)"""
+    import pandas as pd
+    return perfiles_desde_dataframe(csr, pd.read_csv(nombre_archivo), periodo)
+
+
+# ------------------ búsquedas ------------------
+
+def _factor_cota(grafo_t):
+    """
+    Menor tiempo de viaje por unidad de longitud euclidiana entre todos
+    los arcos y horas. factor * distancia euclidiana es una cota inferior
+    del tiempo restante, así que la heurística de A* sigue siendo admisible
+    y consistente.
+    """
+    origenes = np.repeat(np.arange(grafo_t.num_nodos), np.diff(grafo_t.indptr))
+    longitudes = np.linalg.norm(grafo_t.pos[origenes] - grafo_t.pos[grafo_t.indices], axis=1)
+    minimos = np.minimum.reduceat(grafo_t.valores, grafo_t.offsets[:-1]) if grafo_t.num_arcos else np.array([])
+    con_longitud = longitudes > 0
+    if not con_longitud.any():
+        return 0.0
+    return float((minimos[con_longitud] / longitudes[con_longitud]).min())
+
+
+def _busqueda_temporal(grafo_t, origen, destino, salida, cota):
+    """
+    Dijkstra sobre horas de llegada: con FIFO, llegar antes a un nodo nunca
+    empeora lo que sigue, así que el primer asentamiento es óptimo.
+    'cota(i)' es la heurística de A* (0 para Dijkstra).
+    """
+    start_time = time.time()
+    s, t = grafo_t.indice[origen], grafo_t.indice[destino]
+    indptr, indices = grafo_t._indptr, grafo_t._indices
+    nodos_expandidos = 0
+
+    llegada = {s: float(salida)}
+    predecesores = {}
+    cola = [(llegada[s] + cota(s), llegada[s], s)]
+
+    while cola:
+        _, t_u, u = heapq.heappop(cola)
+        if t_u > llegada[u]:
+            continue  # Entrada obsoleta
+        nodos_expandidos += 1
+        if u == t:
+            break
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nueva = t_u + grafo_t.tiempo_viaje(k, t_u)
+            if nueva < llegada.get(v, INF):
+                llegada[v] = nueva
+                predecesores[v] = u
+                heapq.heappush(cola, (nueva + cota(v), nueva, v))
+
+    ruta = []
+    if t in llegada:
+        ruta = [t]
+        while ruta[-1] != s:
+            ruta.append(predecesores[ruta[-1]])
+        ruta = grafo_t.ruta_a_ids(ruta[::-1])
+
+    return {
+        'ruta': ruta,
+        'distancia': llegada[t] - salida if t in llegada else INF,  # Duración del viaje
+        'llegada': llegada.get(t, INF),
+        'nodos_expandidos': nodos_expandidos,
+        'tiempo': time.time() - start_time
+    }
+
+
+def dijkstra_dependiente_tiempo(grafo_t, origen, destino, salida=0.0):
+    """
+    Ruta más rápida saliendo del origen a la hora 'salida'.
+
+    Returns:
+        dict con ruta, distancia (duración del viaje), llegada (hora de
+        llegada), nodos_expandidos, tiempo
+    """
+    return _busqueda_temporal(grafo_t, origen, destino, salida, lambda i: 0.0)
+
+
+def astar_dependiente_tiempo(grafo_t, origen, destino, salida=0.0):
+    """
+    A* dependiente del tiempo: la heurística es la distancia euclidiana
+    al destino por el menor tiempo por unidad de longitud del grafo
+    (calculado una vez y guardado en el grafo).
+    """
+    if grafo_t.pos is None:
+        raise ValueError("A* dependiente del tiempo requiere coordenadas 'pos'")
+    if grafo_t._factor_cota is None:
+        grafo_t._factor_cota = _factor_cota(grafo_t)
+
+    factor = grafo_t._factor_cota
+    pos = grafo_t.pos.tolist()
+    x_t, y_t = pos[grafo_t.indice[destino]]
+
+    def cota(i):
+        x, y = pos[i]
+        return factor * math.sqrt((x - x_t) ** 2 + (y - y_t) ** 2)
+
+    return _busqueda_temporal(grafo_t, origen, destino, salida, cota)
@@ -17,7 +17,7 @@ def visualizar_grafo_interactivo(grafo, ruta=None, altura="600px", ancho="100%")
         str: Ruta al archivo HTML generado
     """
     # Crear red PyVis
-    net = Network(height=altura, width=ancho, directed=False)
+    net = Network(height=altura, width=ancho, directed=grafo.is_directed())
     
     # Configuraciones de visualización
     net.set_options("""